@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 from typing import TYPE_CHECKING
 
 from nebulous.game.models import PlayerName
@@ -101,12 +102,8 @@ class InternalCallbacks:
 
             client.game_world.players.append(game_player)
 
-        for dot in packet.dot_objects:
-            game_dot = GameDot(
-                dot.xpos.value,
-                dot.ypos.value,
-                dot.dot_id,
-            )
+        for dot_id, xpos, ypos in zip(packet.dot_ids, packet.dot_xs, packet.dot_ys, strict=True):
+            game_dot = GameDot(xpos, ypos, dot_id)
 
             client.game_world.dots.append(game_dot)
 
@@ -134,13 +131,17 @@ class InternalCallbacks:
 
     @staticmethod
     async def on_game_chat_message(client: Client, packet: GameChatMessage) -> GameChatMessage:
-        client.logger.info(f"Received game chat message: {packet.as_json()}")
+        # only serialize the packet if the message is actually going to be logged
+        if client.logger.isEnabledFor(logging.INFO):
+            client.logger.info("Received game chat message: %s", packet.as_json())
 
         return await client.callbacks.on_game_chat_message(client, packet)
 
     @staticmethod
     async def on_clan_chat_message(client: Client, packet: ClanChatMessage) -> ClanChatMessage:
-        client.logger.info(f"Received clan chat message: {packet.as_json()}")
+        # only serialize the packet if the message is actually going to be logged
+        if client.logger.isEnabledFor(logging.INFO):
+            client.logger.info("Received clan chat message: %s", packet.as_json())
 
         return await client.callbacks.on_clan_chat_message(client, packet)
 
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import copy
 import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import StrEnum
 from http import HTTPStatus
 from typing import Any, ClassVar
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from nebulous.game import constants
 from nebulous.game.enums import (
@@ -86,6 +94,53 @@ class Endpoints(StrEnum):
     GET_ALERTS = "GetAlerts"
 
 
+# every api call goes to the same host, so share one session to reuse its
+# keep-alive connections instead of doing a fresh tcp + tls handshake per call
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=Retry(total=3, backoff_factor=0.2)),
+)
+
+# profile and stats responses are read-mostly, so an account created with
+# cache_players=True reuses them for a short while instead of refetching.
+_PLAYER_CACHE_TTL = 180.0
+
+# the api has no batch endpoint for profiles or stats, so bulk fetches fan out
+# over a small, rate limited pool instead so we don't hammer the api.
+_BULK_MAX_WORKERS = 8
+_BULK_MAX_REQUESTS_PER_SECOND = 5
+
+
+class _RateLimiter:
+    # token bucket shared by the workers of a bulk fetch. requests go out as
+    # soon as a token is free instead of waiting out a fixed sleep each.
+    def __init__(self, rate: float, per: float = 1.0):
+        self.rate = rate
+        self.per = per
+        self._tokens = rate
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._last) * self.rate / self.per)
+                self._last = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+
+                    return
+
+                wait = (1 - self._tokens) * self.per / self.rate
+
+            # sleep without the lock, so the other workers can still check for a token.
+            # another worker may take the next one first, in which case this just waits again.
+            time.sleep(wait)
+
+
 @dataclass
 class AccountObject:
     """
@@ -138,6 +193,93 @@ class APIPlayer(AccountObject):
 
         return self.account.get_player_stats(self.account_id)
 
+    async def aget_profile(self) -> APIPlayerProfile:
+        """
+        Retrieves the player's profile without blocking the event loop.
+
+        Returns:
+            APIPlayerProfile: The player's profile.
+
+        Raises:
+            InvalidUserIDError: If the account ID is not valid.
+        """
+        return await asyncio.to_thread(self.get_profile)
+
+    async def aget_stats(self) -> APIPlayerStats:
+        """
+        Retrieves the player's stats without blocking the event loop.
+
+        Returns:
+            APIPlayerStats: The player's stats.
+
+        Raises:
+            InvalidUserIDError: If the account ID is not valid.
+        """
+        return await asyncio.to_thread(self.get_stats)
+
+    @staticmethod
+    def _fetch_many(fetch: Callable[[int], Any], account_ids: Iterable[int]) -> dict[int, Any]:
+        account_ids = list(dict.fromkeys(account_ids))
+
+        for account_id in account_ids:
+            if account_id < 0:
+                raise InvalidUserIDError(f"Invalid account ID: {account_id}")
+
+        if len(account_ids) == 0:
+            return {}
+
+        limiter = _RateLimiter(_BULK_MAX_REQUESTS_PER_SECOND)
+
+        def fetch_limited(account_id: int) -> Any:
+            limiter.acquire()
+
+            return fetch(account_id)
+
+        # results are collected in account id order. the first failure in that order is raised, which also
+        # cancels the fetches that haven't started yet. the results and errors of the others are dropped.
+        with ThreadPoolExecutor(max_workers=min(len(account_ids), _BULK_MAX_WORKERS)) as executor:
+            return dict(zip(account_ids, executor.map(fetch_limited, account_ids), strict=True))
+
+    @classmethod
+    def get_profiles_bulk(cls, account: Account, account_ids: Iterable[int]) -> dict[int, APIPlayerProfile]:
+        """
+        Retrieves the profiles of several players at once.
+
+        Args:
+            account (Account): The account to make the requests with.
+            account_ids (Iterable[int]): The IDs of the players' accounts.
+
+        Returns:
+            dict[int, APIPlayerProfile]: The players' profiles, keyed by account ID, in the order the IDs were
+                first given. Repeated IDs are only fetched once.
+
+        Raises:
+            InvalidUserIDError: If any of the account IDs are not valid.
+            Exception: If a request fails. Only the first failure, in account ID order, is raised and the requests
+                that haven't been sent yet are skipped.
+        """
+        return cls._fetch_many(account.get_player_profile, account_ids)
+
+    @classmethod
+    def get_stats_bulk(cls, account: Account, account_ids: Iterable[int]) -> dict[int, APIPlayerStats]:
+        """
+        Retrieves the stats of several players at once.
+
+        Args:
+            account (Account): The account to make the requests with.
+            account_ids (Iterable[int]): The IDs of the players' accounts.
+
+        Returns:
+            dict[int, APIPlayerStats]: The players' stats, keyed by account ID, in the order the IDs were
+                first given. Repeated IDs are only fetched once.
+
+        Raises:
+            InvalidUserIDError: If any of the account IDs are not valid.
+            Exception: If a request fails. Only the first failure, in account ID order, is raised and the requests
+                that haven't been sent yet are skipped.
+        """
+        return cls._fetch_many(account.get_player_stats, account_ids)
+
     @classmethod
     def from_account_id(cls, account: Account, account_id: int) -> APIPlayer:
         """
@@ -501,6 +643,7 @@ class SignedInPlayer(APIPlayer):
             raise NotSignedInError("Cannot checkin without an account.")
 
         response = self.account.request_endpoint(Endpoints.CHECKIN, {})
+        self.account.invalidate_player(self.account_id)
 
         return APICheckinResult(
             response["CheckinReward"],
@@ -603,11 +746,13 @@ class Account:
         sale_info (APISaleInfo): Current sale information.
         skin_url_base (APISkinURLBase): The base URL for skin operations, among other things.
         purchase_prices (APIPurchasePrices): The current purchase prices for items in-game.
+        cache_players (bool): Whether player profiles and stats are reused for a few minutes instead of refetched.
 
     Methods:
-        __init__(self, ticket: str, region: ServerRegions, log_level: int = logging.INFO): Initializes an Account
-            object.
-        no_account(cls, region: ServerRegions) -> Account: Creates an Account object without a ticket.
+        __init__(self, ticket: str, region: ServerRegions, log_level: int = logging.INFO,
+            cache_players: bool = False): Initializes an Account object.
+        no_account(cls, region: ServerRegions, cache_players: bool = False) -> Account: Creates an Account object
+            without a ticket.
         refresh(self): Refreshes the secure ticket.
         get_region_ip(self) -> str: Returns the server IP address of the region.
         get_region(self) -> ServerRegions: Returns the name of the region.
@@ -628,13 +773,16 @@ class Account:
         get_skin_ids(self, skin_type: CustomSkinType = CustomSkinType.ALL) -> APISkinIDs: Retrieves skin IDs.
         get_friends(self, start_index: int = 0, include_friend_requests: bool = True, search: str = "",
             count: int = 100, include_friend_invites: bool = True) -> list[APIFriend]: Retrieves the list of friends.
+        invalidate_player(self, account_id: int): Drops the cached profile and stats for a player.
     """
     API_URL: ClassVar[str] = "https://simplicialsoftware.com/api/account/"
 
-    def __init__(self, ticket: str, region: ServerRegions, log_level: int = logging.INFO):
+    def __init__(self, ticket: str, region: ServerRegions, log_level: int = logging.INFO, cache_players: bool = False):
         self.ticket = Ticket(ticket)
         self.region = Region(region, "")
         self.logger = logging.getLogger("AccountAPI")
+        self.cache_players = cache_players
+        self._player_cache: dict[tuple[Endpoints, int], tuple[float, dict]] = {}
 
         logging.basicConfig(
             format="[%(asctime)s] %(levelname)s: %(message)s",
@@ -670,18 +818,20 @@ class Account:
         self.logger.info(f"Region IP: {self.region.ip}")
 
     @classmethod
-    def no_account(cls, region: ServerRegions) -> Account:
+    def no_account(cls, region: ServerRegions, cache_players: bool = False) -> Account:
         """
         Creates a new Account object with no account information.
 
         Args:
             cls (Account): The Account class.
             region (ServerRegions): The server region for the account.
+            cache_players (bool): Whether to reuse player profiles and stats for a few minutes instead of refetching
+                them.
 
         Returns:
             Account: A new Account object with no account information.
         """
-        return cls("", region)
+        return cls("", region, cache_players=cache_players)
 
     def refresh(self):
         """
@@ -781,6 +931,9 @@ class Account:
         """
         response = self.request_endpoint(Endpoints.GET_SPIN_INFO, {"Spin": spin})
 
+        if spin:
+            self.invalidate_player(self.account_id)
+
         return APIWheelOfNebulous(
             self,
             SpinType[response["SpinType"]],
@@ -884,6 +1037,7 @@ class Account:
             data_map["ExpectedPrice"] = price
 
         response = self.request_endpoint(Endpoints.COIN_PURCHASE, data_map)
+        self.invalidate_player(self.account_id)
 
         return APICoinPurchaseResult(
             PurchasableType[response["ItemType"]],
@@ -1067,12 +1221,7 @@ class Account:
         Returns:
             APIPlayerProfile: An instance of the APIPlayerProfile class representing the player profile.
         """
-        response = self.request_endpoint(
-            Endpoints.GET_PLAYER_PROFILE,
-            {
-                "accountID": account_id,
-            },
-        )
+        response = self._request_player_endpoint(Endpoints.GET_PLAYER_PROFILE, "accountID", account_id)
 
         return APIPlayerProfile(
             response["profile"],
@@ -1116,12 +1265,7 @@ class Account:
         Returns:
             APIPlayerStats: The player statistics for the account.
         """
-        response = self.request_endpoint(
-            Endpoints.GET_PLAYER_STATS,
-            {
-                "AccountID": account_id,
-            },
-        )
+        response = self._request_player_endpoint(Endpoints.GET_PLAYER_STATS, "AccountID", account_id)
 
         clan = Clan(response["ClanName"], response["ClanColors"], response["clanID"])
 
@@ -1251,6 +1395,33 @@ class Account:
             response["ClanColors"],
         )
 
+    def invalidate_player(self, account_id: int):
+        """
+        Drops any cached profile and stats for the given account ID, so the next lookup refetches them.
+
+        Args:
+            account_id (int): The ID of the account.
+        """
+        self._player_cache.pop((Endpoints.GET_PLAYER_PROFILE, account_id), None)
+        self._player_cache.pop((Endpoints.GET_PLAYER_STATS, account_id), None)
+
+    def _request_player_endpoint(self, endpoint: Endpoints, id_key: str, account_id: int) -> dict:
+        if not self.cache_players:
+            return self.request_endpoint(endpoint, {id_key: account_id})
+
+        key = (endpoint, account_id)
+        cached = self._player_cache.get(key)
+
+        # the cached response is never handed out itself, so nothing the caller
+        # does to the returned dict (or the lists in it) leaks into later lookups.
+        if cached is not None and time.monotonic() - cached[0] < _PLAYER_CACHE_TTL:
+            return copy.deepcopy(cached[1])
+
+        response = self.request_endpoint(endpoint, {id_key: account_id})
+        self._player_cache[key] = (time.monotonic(), copy.deepcopy(response))
+
+        return response
+
     def request_endpoint(self, endpoint: Endpoints, data: dict) -> dict:
         """
         Sends a request to the specified endpoint with the provided data.
@@ -1276,7 +1447,7 @@ class Account:
         self.logger.info(f"Requesting endpoint: {endpoint!s}")
         self.logger.info(f"Post Data: {default_data}")
 
-        response = requests.post(url, data=default_data, timeout=10)
+        response = SESSION.post(url, data=default_data, timeout=10)
 
         if response.status_code != HTTPStatus.OK:
             raise Exception(f"Request failed with status code: {response.status_code}. Response: {response.text}")
@@ -1300,4 +1471,5 @@ __all__ = [
     "APIWheelOfNebulous",
     "AccountObject",
     "Endpoints",
+    "SESSION",
 ]
@@ -41,13 +41,13 @@ class PlayerName:
     Attributes:
         name (str): The name of the player.
         font (Font, optional): The font used for displaying the player's name. Defaults to Font.DEFAULT.
-        colors (list[int], optional): The colors used for displaying the player's name. Defaults to
-            [-1, -1, -1, -1, -1, -1].
+        colors (list[int] | bytearray, optional): The colors used for displaying the player's name. Names decoded
+            from game data carry their colors as unsigned bytes. Defaults to [-1, -1, -1, -1, -1, -1].
         animation (NameAnimation, optional): The animation style for the player's name. Defaults to NameAnimation.NONE.
     """
     name: str
     font: Font = Font.DEFAULT
-    colors: list[int] = field(default_factory=([-1] * 6).copy)
+    colors: list[int] | bytearray = field(default_factory=([-1] * 6).copy)
     animation: NameAnimation = NameAnimation.NONE
 
 
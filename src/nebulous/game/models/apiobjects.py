@@ -361,13 +361,14 @@ class Clan:
 
     Attributes:
         name (str): The name of the clan.
-        colors (list[int]): The colors associated with the clan.
+        colors (list[int] | bytearray): The colors associated with the clan. Clans decoded from game data carry
+            their colors as unsigned bytes.
         id (int): The ID of the clan.
         coins (int): The number of coins(plasma) owned by the clan.
     """
 
     name: str
-    colors: list[int] = field(default_factory=([-1] * 6).copy)
+    colors: list[int] | bytearray = field(default_factory=([-1] * 6).copy)
     id: int = 0
     coins: int = -1
 
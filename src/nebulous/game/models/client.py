@@ -171,7 +171,7 @@ class LobbyChat:
             PacketType.GAME_CHAT_MESSAGE,
             MUTF8String.from_py_string(self.alias),
             MUTF8String.from_py_string(message),
-            VariableLengthArray(1, self.alias_colors),
+            VariableLengthArray.from_py_list(1, self.alias_colors),
             self.show_broadcast_bubble,
             self.alias_font,
         )
@@ -344,7 +344,6 @@ class Client:
             TimeoutError: If the socket times out while sending packets.
         """
         logger = logging.getLogger("SendLoop")
-        loop = asyncio.get_event_loop()
 
         logger.info("Starting send loop...")
 
@@ -352,48 +351,60 @@ class Client:
             last_heartbeat = time.time()
             heartbeat_interval = 0.5
 
-            while await self.game_data_done.wait() and not self.stop_event.is_set():
-                if self.packet_queue.empty():
-                    if time.time() - last_heartbeat < heartbeat_interval:
-                        continue
-
-                    logger.info("Sending keep-alive packet...")
+            # the ids are fixed once connected, so the same keep-alive is sent every heartbeat
+            keep_alive_packet = KeepAlive(
+                PacketType.KEEP_ALIVE,
+                self.server_data.public_id,
+                self.server_data.private_id,
+                inet_aton(self.account.region.ip),
+                self.server_data.client_id,
+            )
 
-                    keep_alive_packet = KeepAlive(
-                        PacketType.KEEP_ALIVE,
-                        self.server_data.public_id,
-                        self.server_data.private_id,
-                        inet_aton(self.account.region.ip),
-                        self.server_data.client_id,
-                    )
+            while await self.game_data_done.wait() and not self.stop_event.is_set():
+                packets: list[Packet] = []
 
-                    packet_data = keep_alive_packet.write(self)
+                if self.packet_queue.empty():
+                    remaining = heartbeat_interval - (time.time() - last_heartbeat)
+
+                    if remaining > 0:
+                        # sleep until a packet is queued or the next heartbeat is due, rather
+                        # than spinning (the event wait above doesn't yield once it is set)
+                        try:
+                            packets.append(await asyncio.wait_for(self.packet_queue.get(), timeout=remaining))
+                        except TimeoutError:
+                            continue
+                    else:
+                        logger.info("Sending keep-alive packet...")
+
+                        # send control packet alongside keep-alive. perhaps the server needs it
+                        # to keep track of the client's connection state?
+                        control_packet = Control(
+                            PacketType.CONTROL,
+                            0.0,
+                            0.0,
+                            ControlFlags.NONE,
+                            self.config.screen.as_aspect_ratio(),
+                        )
 
-                    await asyncio.wait_for(loop.sock_sendall(self.socket, packet_data), timeout=5.0)
-                    await InternalCallbacks.on_keep_alive(self, keep_alive_packet)
+                        logger.info("Sending heartbeat control packet...")
+                        await asyncio.wait_for(
+                            self.send_frames([keep_alive_packet.write(self), control_packet.write(self)]),
+                            timeout=5.0,
+                        )
+                        await InternalCallbacks.on_keep_alive(self, keep_alive_packet)
+                        await InternalCallbacks.on_control(self, control_packet)
 
-                    # send control packet alongside keep-alive. perhaps the server needs it
-                    # to keep track of the client's connection state?
-                    logger.info("Sending heartbeat control packet...")
-                    control_packet = Control(
-                        PacketType.CONTROL,
-                        0.0,
-                        0.0,
-                        ControlFlags.NONE,
-                        self.config.screen.as_aspect_ratio(),
-                    )
+                        last_heartbeat = time.time()
 
-                    packet_data = control_packet.write(self)
+                        continue
 
-                    await asyncio.wait_for(loop.sock_sendall(self.socket, packet_data), timeout=5.0)
-                    await InternalCallbacks.on_control(self, control_packet)
+                # drain everything queued so far and send it as a single batch
+                packets.extend(self.packet_queue.get_nowait() for _ in range(self.packet_queue.qsize()))
 
-                    last_heartbeat = time.time()
-                else:
-                    packet: Packet = await self.packet_queue.get()
+                for packet in packets:
+                    logger.info("Sending packet: %s", packet.packet_type.name)
 
-                    logger.info(f"Sending packet: {packet.packet_type.name}")
-                    await asyncio.wait_for(loop.sock_sendall(self.socket, packet.write(self)), timeout=5.0)
+                await asyncio.wait_for(self.send_frames([packet.write(self) for packet in packets]), timeout=5.0)
         except KeyboardInterrupt:
             logger.info("Send loop interrupted.")
         except TimeoutError:
@@ -402,6 +413,19 @@ class Client:
             if self.state != ClientState.DISCONNECTING and not self.stop_event.is_set():
                 await self.stop()
 
+    async def send_frames(self, frames: list[bytes]) -> None:
+        """
+        Sends a batch of packet frames to the server back to back, one datagram per frame.
+
+        Args:
+            frames (list[bytes]): The encoded packets to send.
+        """
+        loop = asyncio.get_event_loop()
+        sendall = loop.sock_sendall
+
+        for frame in frames:
+            await sendall(self.socket, frame)
+
     async def connect(self) -> bool:
         """
         Connects the client to the server.
@@ -430,7 +454,7 @@ class Client:
                 self.config.eject_skin,
                 MUTF8String.from_py_string(self.random_alias),
                 self.config.custom_skin,
-                VariableLengthArray(1, self.config.alias_colors),
+                VariableLengthArray.from_py_list(1, self.config.alias_colors),
                 self.config.pet1,
                 self.config.blob_color,
                 MUTF8String.from_py_string(self.config.pet1_name),
@@ -443,12 +467,12 @@ class Client:
                 self.config.custom_particle,
                 self.config.particle_type,
                 self.config.alias_font,
-                VariableLengthArray(1, self.config.level_colors),
+                VariableLengthArray.from_py_list(1, self.config.level_colors),
                 self.config.alias_anim,
                 self.config.skin2,
                 CompressedFloat(self.config.skin_interpolation_rate, 60.0),
                 self.config.custom_skin2,
-                VariableLengthArray(2, list(self.account.secure_bytes)),
+                VariableLengthArray(2, bytearray(self.account.secure_bytes)),
             )
 
             await asyncio.wait_for(loop.sock_sendall(self.socket, connect_request_3_packet.write(self)), timeout=5.0)
@@ -495,8 +519,9 @@ class Client:
         Raises:
             TimeoutError: If the socket times out.
         """
-        # cache value2member map outside of loop
+        # cache value2member map and the handler table outside of loop
         value2member_map = PacketType._value2member_map_
+        handlers = PacketHandler.handlers
         logger = logging.getLogger("RecvLoop")
         gamedata_received = 0
         loop = asyncio.get_event_loop()
@@ -513,8 +538,10 @@ class Client:
 
                     continue
 
-                packet_handler = PacketHandler.get_handler(PacketType(data[0]))
-                packet_name = PacketType(data[0]).name
+                # the packet type is a single byte, so it always indexes into the handler table
+                packet_type = value2member_map[data[0]]
+                packet_handler = handlers[data[0]]
+                packet_name = packet_type.name
 
                 if not self.game_data_done.is_set():
                     if packet_name == "GAME_DATA":
@@ -534,7 +561,7 @@ class Client:
                     continue
 
                 logger.info(f"Received packet: {packet_name}")
-                await packet_handler.read(self, PacketType(data[0]), data)
+                await packet_handler.read(self, packet_type, data)  # type: ignore
         except KeyboardInterrupt:
             logger.info("Receive loop interrupted.")
         except TimeoutError:
@@ -70,7 +70,8 @@ class GamePlayer(GameObject):
         team_id (int): The team ID of the player.
         clan_member (ClanMember): The clan member status of the player.
         click_type (int): The click type of the player.
-        level_colors (list[int]): The level colors of the player. Default is [0x77] * 5.
+        level_colors (list[int] | bytearray): The level colors of the player, as unsigned bytes when decoded from
+            game data. Default is [0x77] * 5.
     """
     name: PlayerName
     level: int
@@ -92,7 +93,7 @@ class GamePlayer(GameObject):
     team_id: int
     clan_member: ClanMember
     click_type: int
-    level_colors: list[int] = field(default_factory=([0x77] * 5).copy)
+    level_colors: list[int] | bytearray = field(default_factory=([0x77] * 5).copy)
 
 
 @dataclass
@@ -15,7 +15,7 @@ from nebulous.game.enums import (
 from nebulous.game.natives import CompressedFloat, MUTF8String, VariableLengthArray
 
 
-@dataclass
+@dataclass(slots=True)
 class NetPlayer:
     """
     Represents a network player in the game. Network players are the player objects returned by
@@ -89,7 +89,7 @@ class NetPlayer:
     click_type: int  # 1 byte
 
 
-@dataclass
+@dataclass(slots=True)
 class NetPlayerEject:
     """
     Represents an ejected mass object in the network game.
@@ -106,7 +106,7 @@ class NetPlayerEject:
     mass: CompressedFloat  # 3 bytes, relative to 500000.0
 
 
-@dataclass
+@dataclass(slots=True)
 class NetGameDot:
     """
     Represents a dot in the network game.
@@ -121,7 +121,7 @@ class NetGameDot:
     ypos: CompressedFloat  # 3 bytes, relative to GameData.map_size
 
 
-@dataclass
+@dataclass(slots=True)
 class NetGameItem:
     """
     Represents a network game item.
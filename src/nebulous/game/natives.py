@@ -1,15 +1,54 @@
-from dataclasses import dataclass
+import bisect
+import functools
+import struct
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from typing import ClassVar, Self
 
 from datastream import DeserializingStream
 
+_UINT8 = struct.Struct(">B")
+_UINT16 = struct.Struct(">H")
+_UINT32 = struct.Struct(">I")
 
-@dataclass
+# length prefix packers for VariableLengthArray, keyed by prefix size
+_LENGTH_PACKERS = {1: _UINT8.pack, 2: _UINT16.pack, 4: _UINT32.pack}
+_LENGTH_UNPACKERS = {1: _UINT8.unpack_from, 2: _UINT16.unpack_from, 4: _UINT32.unpack_from}
+
+
+def _unpack_uint24(data: bytes | memoryview, stride: int = 3) -> tuple[int, ...]:
+    # widen each 3-byte big endian value to 4 bytes so the whole run can be
+    # decoded with a single struct call instead of one int.from_bytes per value.
+    # values are `stride` bytes apart, which lets a field be pulled straight out
+    # of a run of fixed size records.
+    count = (len(data) + stride - 3) // stride
+    buf = bytearray(count * 4)
+    buf[1::4] = data[0::stride]
+    buf[2::4] = data[1::stride]
+    buf[3::4] = data[2::stride]
+
+    return struct.unpack(f">{count}I", buf)
+
+
+# names, clan names and pet names repeat heavily across players and packets, so
+# decoded values are cached by their raw bytes. this also shares a single string
+# object for equal values.
+@functools.lru_cache(maxsize=4096)
+def _decode_mutf8(raw: bytes) -> str:
+    # most names are plain ascii, which skips the utf-8 decoder entirely
+    if raw.isascii():
+        return raw.decode("ascii")
+
+    return raw.decode("utf-8", errors="backslashreplace")
+
+
+@dataclass(slots=True)
 class MUTF8String:
     MAX_LENGTH: ClassVar[int] = 0xFFFF
 
     length: int  # 2 bytes
     _value: str
+    _encoded: bytes | None = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def value(self) -> str:
@@ -17,95 +56,183 @@ class MUTF8String:
 
     @value.setter
     def value(self, value: str) -> None:
+        data = value.encode("utf-8")
+
         # max length is implicitly implied by the way the JDK encodes strings
-        if len(value) > MUTF8String.MAX_LENGTH:
+        if len(data) > MUTF8String.MAX_LENGTH:
             raise ValueError("String is too long")
 
-        self.length = len(value)
+        self.length = len(data)
         self._value = value
+        self._encoded = None
 
     def encode(self) -> bytes:
-        return self.length.to_bytes(2, byteorder="big") + self._value.encode("utf-8")
+        # the length prefix is the encoded byte length, not the character count
+        if self._encoded is None:
+            data = self._value.encode("utf-8")
+            self._encoded = _UINT16.pack(len(data)) + data
+
+        return self._encoded
+
+    def encode_into(self, buf: bytearray) -> None:
+        buf += self.encode()
 
     @classmethod
     def from_py_string(cls, value: str) -> Self:
-        return cls(len(value), value)
+        return cls(len(value.encode("utf-8")), value)
 
     @classmethod
     def from_stream(cls, stream: DeserializingStream) -> Self:
         length = stream.read_uint16()
-        value = stream.read(length).decode("utf-8", errors="backslashreplace")
+        value = _decode_mutf8(stream.read(length))
 
         return cls(length, value)
 
+    @classmethod
+    def from_buffer(cls, view: memoryview, pos: int) -> tuple[Self, int]:
+        (length,) = _UINT16.unpack_from(view, pos)
+        pos += 2
+        value = _decode_mutf8(bytes(view[pos:pos + length]))
 
-@dataclass
+        return cls(length, value), pos + length
+
+
+def _read_length(size: int, data: bytes | memoryview, pos: int) -> int:
+    unpack = _LENGTH_UNPACKERS.get(size)
+
+    if unpack is not None:
+        return unpack(data, pos)[0]
+
+    return int.from_bytes(data[pos:pos + size], byteorder="big")
+
+
+@dataclass(slots=True)
 class VariableLengthArray:
     """
-    An array of bytes whose encoded length can vary in byte length.
+    An array of bytes whose encoded length can vary in byte length. Values are stored as unsigned bytes.
     """
     size: int
-    values: list[int]
+    values: bytearray
+
+    def __post_init__(self) -> None:
+        # untyped callers may still pass plain lists of ints, store them as raw bytes
+        if not isinstance(self.values, bytearray):
+            self.values = bytearray(value & 0xFF for value in self.values)
 
     def encode(self) -> bytes:
+        buf = bytearray()
+        self.encode_into(buf)
+
+        return bytes(buf)
+
+    def encode_into(self, buf: bytearray) -> None:
         if len(self.values) > (1 << (8 * self.size)) - 1:
             raise ValueError("Array is too long")
 
-        buf = bytearray()
-        buf.extend(len(self.values).to_bytes(self.size, byteorder="big"))
+        pack = _LENGTH_PACKERS.get(self.size)
 
-        for value in self.values:
-            buf.append(value & 0xFF)
+        if pack is not None:
+            buf += pack(len(self.values))
+        else:
+            buf += len(self.values).to_bytes(self.size, byteorder="big")
 
+        buf += self.values
 
-        return bytes(buf)
+    @classmethod
+    def from_py_list(cls, size: int, values: Iterable[int]) -> Self:
+        # signed values such as -1 wrap to their unsigned byte
+        return cls(size, bytearray(value & 0xFF for value in values))
 
     @classmethod
     def from_stream(cls, size: int, stream: DeserializingStream) -> Self:
-        length = int.from_bytes(stream.read(size), signed=True)
-        values = [stream.read_int8() for _ in range(length)]
+        length = _read_length(size, stream.read(size), 0)
+
+        return cls(size, bytearray(stream.read(length)))
+
+    @classmethod
+    def from_buffer(cls, size: int, view: memoryview, pos: int) -> tuple[Self, int]:
+        length = _read_length(size, view, pos)
+        pos += size
+
+        return cls(size, bytearray(view[pos:pos + length])), pos + length
+
+
+def decompress_3_many(
+    max_range: float, count: int, view: memoryview, pos: int, stride: int = 3
+) -> tuple[list[float], int]:
+    """
+    Decode `count` 3 byte compressed floats spaced `stride` bytes apart into plain floats, without
+    wrapping each one in a CompressedFloat. Returns the values and the offset just past the last value.
+    """
+    if count == 0:
+        return [], pos
+
+    end = pos + (count - 1) * stride + 3
 
-        return cls(size, values)
+    # keep the multiply before the divide, the same rounding as the single value decoders
+    return [(max_range * a) / 1.6777215e7 for a in _unpack_uint24(view[pos:end], stride)], end
 
 
-@dataclass
+@dataclass(slots=True)
 class CompressedFloat:
     value: float
     max_range: float
 
     def compress(self) -> int:
-        return int(((self.value - 0.0) * 65535.0) / (self.max_range - 0.0))
+        return int((self.value * 65535.0) / self.max_range)
 
     def compress_1_clamp(self, min_v: float) -> int:
         return int(((self.value - min_v) * 255.0) / (self.max_range - min_v))
 
+    def encode_into(self, buf: bytearray) -> None:
+        buf += _UINT16.pack(self.compress())
+
     @classmethod
     def decompress(cls, value: int, max_range: float) -> Self:
-        return cls((((max_range - 0.0) * (value & 0xFFFF)) / 65535.0) + 0.0, max_range)
+        return cls((max_range * value) / 65535.0, max_range)
 
     @classmethod
     def from_stream(cls, max_range: float, stream: DeserializingStream) -> Self:
         return cls.decompress(stream.read_uint16(), max_range)
 
+    @classmethod
+    def from_buffer(cls, max_range: float, view: memoryview, pos: int) -> tuple[Self, int]:
+        return cls.decompress(_UINT16.unpack_from(view, pos)[0], max_range), pos + 2
+
     @classmethod
     def from_3(cls, max_range, stream: DeserializingStream) -> Self:
-        b24_16 = stream.read_uint8() << 16
-        b15_8 = stream.read_uint8() << 8
-        b7_0 = stream.read_uint8()
+        a = int.from_bytes(stream.read(3), byteorder="big")
 
-        a = b24_16 + b15_8 + b7_0
+        return cls((max_range * a) / 1.6777215e7, max_range)
 
-        return cls((((max_range - 0.0) * a) / 1.6777215e7) + 0.0, max_range)
+    @classmethod
+    def from_3_buffer(cls, max_range: float, view: memoryview, pos: int) -> tuple[Self, int]:
+        a = int.from_bytes(view[pos:pos + 3], byteorder="big")
+
+        return cls((max_range * a) / 1.6777215e7, max_range), pos + 3
 
     @classmethod
     def from_1_clamped(cls, min_v: float, max_v: float, stream: DeserializingStream) -> Self:
         value = stream.read_uint8()
 
-        return cls((((max_v - min_v) * (value & 0xFF)) / 255.0) + min_v, max_v)
+        return cls(((max_v - min_v) * value) / 255.0 + min_v, max_v)
+
+    @classmethod
+    def from_1_clamped_buffer(cls, min_v: float, max_v: float, view: memoryview, pos: int) -> tuple[Self, int]:
+        (value,) = _UINT8.unpack_from(view, pos)
+
+        return cls(((max_v - min_v) * value) / 255.0 + min_v, max_v), pos + 1
+
+
+# the xp required to reach level n + 1 is 500 * n^2
+_LEVEL_THRESHOLDS = [500 * i * i for i in range(1024)]
 
 
 def xp2level(xp: int) -> int:
     if xp < 0:
         return 1
 
-    return int((xp / 500) ** 0.5) + 1
+    if xp >= _LEVEL_THRESHOLDS[-1]:
+        return int((xp / 500) ** 0.5) + 1
+
+    return bisect.bisect_right(_LEVEL_THRESHOLDS, xp)
@@ -3,11 +3,15 @@ from __future__ import annotations
 import enum
 import json
 import math
+import operator
+import struct
 import time
-from dataclasses import asdict, dataclass, field
-from typing import TYPE_CHECKING, Any, ClassVar, Self
+from collections.abc import Callable
+from dataclasses import dataclass, field, fields, is_dataclass
+from functools import cached_property
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, ClassVar, Self, TypeVar
 
-from datastream import ByteOrder, DeserializingStream, SerializingStream
 from javarandom import Random as JavaRNG
 
 from nebulous.game import InternalCallbacks
@@ -32,47 +36,193 @@ from nebulous.game.enums import (
     SplitMultiplier,
 )
 from nebulous.game.models.netobjects import NetGameDot, NetGameItem, NetPlayer, NetPlayerEject
-from nebulous.game.natives import CompressedFloat, MUTF8String, VariableLengthArray
+from nebulous.game.natives import CompressedFloat, MUTF8String, VariableLengthArray, decompress_3_many
 
 if TYPE_CHECKING:
     from nebulous.game.models.client import Client
 
+# orjson is an optional speedup for Packet.as_json, the stdlib encoder is used without it
+orjson: ModuleType | None
+
+try:
+    import orjson
+except ImportError:  # no cov
+    orjson = None
+
+_ORJSON_INDENT_OPTIONS = {None: 0, 2: orjson.OPT_INDENT_2} if orjson is not None else {}
+
+
+# fixed-size packet layouts. the leading pad byte skips over the packet type.
+_CONNECT_RESULT_2 = struct.Struct(">xibiiiifb")
+_GAME_DATA_HEADER = struct.Struct(">xifBBHHBB")
+_CHAT_HEADER = struct.Struct(">BI")  # packet type, public id
+_CHAT_HEADER_SIZE = _CHAT_HEADER.size
+_GAME_CHAT_MESSAGE_INFO = struct.Struct(">i?q")  # account id, unknown bool, message id
+_GAME_CHAT_MESSAGE_STYLE = struct.Struct(">?b")  # show broadcast bubble, alias font
+_GAME_CHAT_MESSAGE_TAIL = struct.Struct(">I??")  # client id, pair of unknown bools
+_CLAN_CHAT_MESSAGE_INFO = struct.Struct(">biq")  # clan role, account id, message id
+_CLAN_CHAT_MESSAGE_TAIL = struct.Struct(">bI?")  # unknown byte, client id, unknown bool
+_CONTROL = struct.Struct(">BIHBBBBIB")
+_TWO_PI = math.pi * 2
+_KEEP_ALIVE = struct.Struct(">BII4sI")
+_DISCONNECT = struct.Struct(">BIII")
+_CONNECT_REQUEST_3_HEADER = struct.Struct(">BIQHIBBI")
+_CONNECT_REQUEST_3_SKIN = struct.Struct(">B?HB")  # online mode -> eject skin
+_CONNECT_REQUEST_3_PET = struct.Struct(">BI")  # pet id, blob color
+_CONNECT_REQUEST_3_COSMETICS = struct.Struct(">BIBB")  # hat type -> second pet id
+_CONNECT_REQUEST_3_PARTICLES = struct.Struct(">IIBB")  # second custom pet -> alias font
+_CONNECT_REQUEST_3_APPEARANCE = struct.Struct(">BHHIq")  # name animation -> timestamp
+_UINT32 = struct.Struct(">I")
+
+_INT8 = struct.Struct(">b")
+_EJECT_RECORD_SIZE = 10  # eject id + 3 byte xpos + 3 byte ypos + 3 byte mass
+_ITEM_RECORD_SIZE = 7  # item type + 3 byte xpos + 3 byte ypos
+
+# a NET_PLAYER record is a series of fixed-width runs separated by variable length
+# strings and arrays. each run is read with a single struct call.
+_NET_PLAYER_SKINS = struct.Struct(">bhbiibh")  # player id -> pet level
+_NET_PLAYER_COSMETICS = struct.Struct(">bbbh")  # hat id -> second pet level
+_NET_PLAYER_PARTICLES = struct.Struct(">iib")  # second custom pet id -> particle id
+_NET_PLAYER_APPEARANCE = struct.Struct(">bhHiib")  # name animation -> team id
+_NET_PLAYER_ACCOUNT = struct.Struct(">ih")  # account id, player level
+_NET_PLAYER_CLAN = struct.Struct(">bb")  # clan role, click type
+
+
+# constant blobs written by outbound packets, encoded once up front
+_EMPTY_MUTF8_ENCODED = MUTF8String.from_py_string("").encode()
+_GAME_CHAT_MESSAGE_INFO_ENCODED = _GAME_CHAT_MESSAGE_INFO.pack(-1, False, 0)
+_CLAN_CHAT_MESSAGE_INFO_ENCODED = _CLAN_CHAT_MESSAGE_INFO.pack(0, -1, 0)
+
+
+_E = TypeVar("_E", bound=enum.Enum)
+
+
+def _enum_lookup(enum_type: type[_E]) -> Callable[[Any], _E]:
+    members: dict[Any, _E] = enum_type._value2member_map_  # type: ignore[assignment]
+
+    def lookup(value: Any) -> _E:
+        try:
+            return members[value]
+        except KeyError:
+            # let the enum raise its usual ValueError, or resolve the value through _missing_
+            return enum_type(value)
+
+    return lookup
+
+
+# value -> member lookups for the enums decoded by GameData. these skip the
+# enum constructor, which costs a couple of python level calls per value.
+_TO_SKIN = _enum_lookup(Skin)
+_TO_EJECT_SKIN = _enum_lookup(EjectSkinType)
+_TO_PET = _enum_lookup(PetType)
+_TO_HAT = _enum_lookup(HatType)
+_TO_HALO = _enum_lookup(HaloType)
+_TO_PARTICLE = _enum_lookup(ParitcleType)
+_TO_NAME_ANIMATION = _enum_lookup(NameAnimation)
+_TO_FONT = _enum_lookup(Font)
+_TO_CLAN_ROLE = _enum_lookup(ClanRole)
+_TO_ITEM = _enum_lookup(Item)
+
+
+def _shuffle_bytes(buf: bytearray, rng: JavaRNG, start: int) -> None:
+    """
+    Shuffle `buf[start:]` in place using a Fisher-Yates shuffle driven by `rng`.
+    """
+    next_int = rng.nextInt
+    last = len(buf) - start - 1
+
+    # draw every swap index up front, then apply the swaps in a second pass
+    swaps = [start + next_int(i + 1) for i in range(last, 0, -1)]
+
+    for x, y in zip(range(start + last, start, -1), swaps, strict=True):
+        buf[x], buf[y] = buf[y], buf[x]
+
 
 class PacketEncoder(json.JSONEncoder):
     """
     Custom JSON encoder for encoding packets.
 
     This class extends the `json.JSONEncoder` class and provides custom encoding
-    logic for handling enum objects. It converts enum objects to their corresponding
-    names before encoding.
+    logic for handling enum objects and byte arrays. It converts enum objects to their
+    corresponding names and byte arrays to lists of integers before encoding.
     """
     def default(self, o: Any) -> Any:
         if isinstance(o, enum.Enum):
             return o.name
 
+        if isinstance(o, bytearray):
+            return list(o)
+
         return super().default(o)
 
-    def encode(self, o: Any) -> str:
-        if isinstance(o, enum.Enum):
-            o = o.name
 
-        return super().encode(o)
+def _dataclass_converter(cls: type) -> Callable[[Any], Any]:
+    names = tuple(f.name for f in fields(cls))
+
+    # fetch every field in a single call. attrgetter only returns a tuple for two or more names.
+    getter: Callable[[Any], tuple[Any, ...]]
+
+    if len(names) == 1:
+        get = operator.attrgetter(names[0])
+        getter = lambda o: (get(o),)  # noqa: E731
+    else:
+        getter = operator.attrgetter(*names)
+
+    if "blob_color" in names:
+        def convert(o: Any) -> Any:
+            data = {name: _to_jsonable(value) for name, value in zip(names, getter(o), strict=True)}
+            data["blob_color"] = f"#{data['blob_color'] & 0xFFFFFFFF:08X}"
+
+            return data
+    else:
+        def convert(o: Any) -> Any:
+            return {name: _to_jsonable(value) for name, value in zip(names, getter(o), strict=True)}
+
+    return convert
+
+
+# per-type converters used by Packet.as_json. dataclass converters are built
+# on first use and cached here, native wrappers serialize as their plain value.
+_JSON_CONVERTERS: dict[type, Callable[[Any], Any]] = {
+    MUTF8String: lambda o: o.value,
+    CompressedFloat: lambda o: o.value,
+    range: list,
+}
+
+
+def _to_jsonable(o: Any) -> Any:
+    converter = _JSON_CONVERTERS.get(type(o))
+
+    if converter is not None:
+        return converter(o)
+
+    if isinstance(o, list):
+        return [_to_jsonable(item) for item in o]
+
+    if is_dataclass(o):
+        converter = _JSON_CONVERTERS[type(o)] = _dataclass_converter(type(o))
+
+        return converter(o)
+
+    # plain enums serialize by name. int and str based enums keep their value,
+    # which is what both json encoders already do for them.
+    if isinstance(o, enum.Enum) and not isinstance(o, int | str | float):
+        converter = _JSON_CONVERTERS[type(o)] = _enum_name
+
+        return converter(o)
+
+    return o
 
 
-def custom_dict_factory(data: list[tuple[str, Any]]) -> Any:
-    match data:
-        case [("length", _), ("_value", value)]:
-            return value
-        case [("value", value), ("max_range", _)]:
-            return value
+def _enum_name(o: enum.Enum) -> str:
+    return o.name
 
-    for idx, item in enumerate(data):
-        key, value = item
 
-        if key == "blob_color":
-            data[idx] = ("blob_color", f"#{value & 0xFFFFFFFF:08X}")
+def _orjson_default(o: Any) -> Any:
+    if isinstance(o, bytearray):
+        return list(o)
 
-    return dict(data)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
 
 
 @dataclass
@@ -93,40 +243,53 @@ class Packet:
     async def read(cls, client: Client, packet_type: PacketType, data: bytes) -> Self:
         raise NotImplementedError()
 
-    def as_json(self, indent: int = 2) -> str:
+    def as_json(self, indent: int | None = 2) -> str:
         """
         Serialize the packet object to a JSON formatted string.
 
         Args:
-            indent (int): The number of spaces to use for indentation (default is 2).
+            indent (int | None): The number of spaces to use for indentation (default is 2). None produces
+                compact output on a single line.
 
         Returns:
             str: The JSON string representation of the packet object.
         """
-        return json.dumps(asdict(self, dict_factory=custom_dict_factory), indent=indent, cls=PacketEncoder)
+        data = _to_jsonable(self)
+
+        # orjson only supports compact output or a fixed indent of two spaces
+        if orjson is not None and indent in _ORJSON_INDENT_OPTIONS:
+            return orjson.dumps(data, default=_orjson_default, option=_ORJSON_INDENT_OPTIONS[indent]).decode()
+
+        # match orjson's output, which keeps non-ascii text as is and has no spaces in compact mode
+        if indent is None:
+            return json.dumps(data, separators=(",", ":"), ensure_ascii=False, cls=PacketEncoder)
+
+        return json.dumps(data, indent=indent, ensure_ascii=False, cls=PacketEncoder)
 
 
 class PacketHandler:
-    handlers: ClassVar[dict] = {}
+    # indexed by packet type value. the packet type is a single byte on the wire.
+    handlers: ClassVar[list[type[Packet] | None]] = [None] * 0x100
 
     @classmethod
     def register_handler(cls, packet_type: PacketType):
         def wrapper(handler):
-            cls.handlers[packet_type] = handler
+            cls.handlers[packet_type.value] = handler
             return handler
 
         return wrapper
 
     @classmethod
     def get_handler(cls, packet_type: PacketType) -> type[Packet] | None:
-        if packet_type not in cls.handlers:
+        value = packet_type.value
+
+        if value >= len(cls.handlers):
             return None
 
-        return cls.handlers[packet_type]
+        return cls.handlers[value]
 
 
 @dataclass
-@PacketHandler.register_handler(PacketType.CONNECT_RESULT_2)
 class ConnectResult2(Packet):
     """
     Represents a packet containing the result of a connection attempt.
@@ -153,40 +316,34 @@ class ConnectResult2(Packet):
 
     @classmethod
     async def read(cls, client: Client, packet_type: PacketType, data: bytes) -> ConnectResult2:
-        stream = DeserializingStream(data, byteorder=ByteOrder.NETWORK_ENDIAN)
-
-        # skip over the packet type byte
-        stream.read_int8()
-
-        client_id = stream.read_int32()
-        result = ConnectResult(stream.read_int8())
-        public_id = stream.read_int32()
-        private_id = stream.read_int32()
-        game_id = stream.read_int32()
-        ban_length = stream.read_int32()
-        ad_stuff = stream.read_float()
-        split_multiplier = SplitMultiplier.from_net(stream.read_int8())
-
-        stream.close()
+        (
+            client_id,
+            result,
+            public_id,
+            private_id,
+            game_id,
+            ban_length,
+            ad_stuff,
+            split_multiplier,
+        ) = _CONNECT_RESULT_2.unpack_from(data)
 
         return await InternalCallbacks.on_connect_result(
             client,
             cls(
                 packet_type,
                 client_id,
-                result,
+                ConnectResult(result),
                 public_id,
                 private_id,
                 game_id,
                 ban_length,
                 ad_stuff,
-                split_multiplier,
+                SplitMultiplier.from_net(split_multiplier),
             ),
         )
 
 
 @dataclass
-@PacketHandler.register_handler(PacketType.GAME_DATA)
 class GameData(Packet):
     """
     Represents a packet containing game(lobby) data.
@@ -202,8 +359,10 @@ class GameData(Packet):
         item_count (int): The number of items in the game.
         player_objects (list[NetPlayer]): List of player objects in the game.
         eject_objects (list[NetPlayerEject]): List of eject objects in the game.
-        dot_objects (list[NetGameDot]): List of dot objects in the game.
         item_objects (list[NetGameItem]): List of item objects in the game.
+        dot_ids (range): The IDs of the dots in the game.
+        dot_xs (list[float]): The x-coordinates of the dots, in the same order as `dot_ids`.
+        dot_ys (list[float]): The y-coordinates of the dots, in the same order as `dot_ids`.
     """
 
     public_id: int  # 4 bytes
@@ -216,124 +375,178 @@ class GameData(Packet):
     item_count: int  # 1 byte
     player_objects: list[NetPlayer] = field(default_factory=list)
     eject_objects: list[NetPlayerEject] = field(default_factory=list)
-    dot_objects: list[NetGameDot] = field(default_factory=list)
     item_objects: list[NetGameItem] = field(default_factory=list)
 
-    @classmethod
-    async def read(cls, client: Client, packet_type: PacketType, data: bytes) -> GameData:
-        stream = DeserializingStream(data, byteorder=ByteOrder.NETWORK_ENDIAN)
-
-        # skip over the packet type byte
-        stream.read_int8()
-
-        public_id = stream.read_int32()
-        map_size = stream.read_float()
-        player_count = stream.read_int8()
-        eject_count = stream.read_int8()
-        dot_id_offset = stream.read_int16()
-        dot_count = stream.read_int16()
-        item_id_offset = stream.read_int8()
-        item_count = stream.read_int8()
-
-        player_objects = []
-        for _ in range(player_count):
-            player_id = stream.read_int8()
-            skin_id = Skin(stream.read_int16())
-            eject_skin_id = EjectSkinType(stream.read_int8())
-            custom_skin_id = stream.read_int32()
-            custom_pet_id = stream.read_int32()
-            pet_id = PetType(stream.read_int8())
-            pet_level = stream.read_int16()
-            pet_name = MUTF8String.from_stream(stream)
-            hat_id = HatType(stream.read_int8())
-            halo_id = HaloType(stream.read_int8())
-            pet_id2 = PetType(stream.read_int8())
-            pet_level2 = stream.read_int16()
-            pet_name2 = MUTF8String.from_stream(stream)
-            custom_pet_id2 = stream.read_int32()
-            custom_particle_id = stream.read_int32()
-            particle_id = ParitcleType(stream.read_int8())
-            level_colors = VariableLengthArray.from_stream(1, stream)
-            name_animation_id = NameAnimation(stream.read_int8())
-            skin_id2 = Skin(stream.read_int16())
-            skin_interpolation_rate = CompressedFloat.from_stream(60.0, stream)
-            custom_skin_id2 = stream.read_int32()
-            blob_color = stream.read_int32()
-            team_id = stream.read_int8()
-            player_name = MUTF8String.from_stream(stream)
-            font_id = Font(stream.read_int8())
-            alias_colors = VariableLengthArray.from_stream(1, stream)
-            account_id = stream.read_int32()
-            player_level = stream.read_int16()
-            clan_name = MUTF8String.from_stream(stream)
-            clan_colors = VariableLengthArray.from_stream(1, stream)
-            clan_role = ClanRole(stream.read_int8())
-            click_type = stream.read_int8()
-
-            player_objects.append(
-                NetPlayer(
-                    player_id,
-                    skin_id,
-                    eject_skin_id,
-                    custom_skin_id,
-                    custom_pet_id,
-                    pet_id,
-                    pet_level,
-                    pet_name,
-                    hat_id,
-                    halo_id,
-                    pet_id2,
-                    pet_level2,
-                    pet_name2,
-                    custom_pet_id2,
-                    custom_particle_id,
-                    particle_id,
-                    level_colors,
-                    name_animation_id,
-                    skin_id2,
-                    skin_interpolation_rate,
-                    custom_skin_id2,
-                    blob_color,
-                    team_id,
-                    player_name,
-                    font_id,
-                    alias_colors,
-                    account_id,
-                    player_level,
-                    clan_name,
-                    clan_colors,
-                    clan_role,
-                    click_type,
-                )
-            )
-
-        eject_objects = []
-        for _ in range(eject_count):
-            eject_id = stream.read_int8()
-            xpos = CompressedFloat.from_3(map_size, stream)
-            ypos = CompressedFloat.from_3(map_size, stream)
-            mass = CompressedFloat.from_3(500000.0, stream)
+    # dots are by far the most numerous object, so they are kept as parallel
+    # columns instead of one NetGameDot per dot.
+    dot_ids: range = field(default=range(0), kw_only=True)
+    dot_xs: list[float] = field(default_factory=list, kw_only=True)
+    dot_ys: list[float] = field(default_factory=list, kw_only=True)
 
-            eject_objects.append(NetPlayerEject(eject_id, xpos, ypos, mass))
-
-        dot_objects = []
-        for i in range(dot_count):
-            dot_id = i + dot_id_offset
-            xpos = CompressedFloat.from_3(map_size, stream)
-            ypos = CompressedFloat.from_3(map_size, stream)
-
-            dot_objects.append(NetGameDot(dot_id, xpos, ypos))
+    @cached_property
+    def dot_objects(self) -> list[NetGameDot]:
+        """
+        The dots in the game as NetGameDot objects. Built on first access from the dot columns.
+        """
+        map_size = self.map_size
 
-        item_objects = []
-        for i in range(item_count):
-            item_id = i + item_id_offset
-            item_type = Item(stream.read_int8())
-            xpos = CompressedFloat.from_3(map_size, stream)
-            ypos = CompressedFloat.from_3(map_size, stream)
+        return [
+            NetGameDot(dot_id, CompressedFloat(xpos, map_size), CompressedFloat(ypos, map_size))
+            for dot_id, xpos, ypos in zip(self.dot_ids, self.dot_xs, self.dot_ys, strict=True)
+        ]
 
-            item_objects.append(NetGameItem(item_id, item_type, xpos, ypos))
+    @classmethod
+    async def read(cls, client: Client, packet_type: PacketType, data: bytes) -> GameData:
+        (
+            public_id,
+            map_size,
+            player_count,
+            eject_count,
+            dot_id_offset,
+            dot_count,
+            item_id_offset,
+            item_count,
+        ) = _GAME_DATA_HEADER.unpack_from(data)
+
+        # the body is decoded straight out of the packet buffer, tracking the offset by hand
+        view = memoryview(data)
+        pos = _GAME_DATA_HEADER.size
+
+        # bind hot lookups to locals once, rather than on every field of every object
+        read_mutf8 = MUTF8String.from_buffer
+        read_array = VariableLengthArray.from_buffer
+        to_skin = _TO_SKIN
+        to_eject_skin = _TO_EJECT_SKIN
+        to_pet = _TO_PET
+        to_hat = _TO_HAT
+        to_halo = _TO_HALO
+        to_particle = _TO_PARTICLE
+        to_name_animation = _TO_NAME_ANIMATION
+        to_font = _TO_FONT
+        to_clan_role = _TO_CLAN_ROLE
+        to_item = _TO_ITEM
+
+        # bind the NET_PLAYER run decoders and their sizes once for the whole player loop
+        unpack_skins, skins_size = _NET_PLAYER_SKINS.unpack_from, _NET_PLAYER_SKINS.size
+        unpack_cosmetics, cosmetics_size = _NET_PLAYER_COSMETICS.unpack_from, _NET_PLAYER_COSMETICS.size
+        unpack_particles, particles_size = _NET_PLAYER_PARTICLES.unpack_from, _NET_PLAYER_PARTICLES.size
+        unpack_appearance, appearance_size = _NET_PLAYER_APPEARANCE.unpack_from, _NET_PLAYER_APPEARANCE.size
+        unpack_account, account_size = _NET_PLAYER_ACCOUNT.unpack_from, _NET_PLAYER_ACCOUNT.size
+        unpack_clan, clan_size = _NET_PLAYER_CLAN.unpack_from, _NET_PLAYER_CLAN.size
+        unpack_int8 = _INT8.unpack_from
+        net_player = NetPlayer
+        decompress = CompressedFloat.decompress
+
+        player_objects: list[NetPlayer] = [None] * player_count  # type: ignore
+        for i in range(player_count):
+            (
+                player_id,
+                skin_id,
+                eject_skin_id,
+                custom_skin_id,
+                custom_pet_id,
+                pet_id,
+                pet_level,
+            ) = unpack_skins(view, pos)
+            pet_name, pos = read_mutf8(view, pos + skins_size)
+            hat_id, halo_id, pet_id2, pet_level2 = unpack_cosmetics(view, pos)
+            pet_name2, pos = read_mutf8(view, pos + cosmetics_size)
+            custom_pet_id2, custom_particle_id, particle_id = unpack_particles(view, pos)
+            level_colors, pos = read_array(1, view, pos + particles_size)
+            (
+                name_animation_id,
+                skin_id2,
+                skin_interpolation_rate,
+                custom_skin_id2,
+                blob_color,
+                team_id,
+            ) = unpack_appearance(view, pos)
+            player_name, pos = read_mutf8(view, pos + appearance_size)
+            (font_id,) = unpack_int8(view, pos)
+            alias_colors, pos = read_array(1, view, pos + 1)
+            account_id, player_level = unpack_account(view, pos)
+            clan_name, pos = read_mutf8(view, pos + account_size)
+            clan_colors, pos = read_array(1, view, pos)
+            clan_role, click_type = unpack_clan(view, pos)
+            pos += clan_size
+
+            player_objects[i] = net_player(
+                player_id,
+                to_skin(skin_id),
+                to_eject_skin(eject_skin_id),
+                custom_skin_id,
+                custom_pet_id,
+                to_pet(pet_id),
+                pet_level,
+                pet_name,
+                to_hat(hat_id),
+                to_halo(halo_id),
+                to_pet(pet_id2),
+                pet_level2,
+                pet_name2,
+                custom_pet_id2,
+                custom_particle_id,
+                to_particle(particle_id),
+                level_colors,
+                to_name_animation(name_animation_id),
+                to_skin(skin_id2),
+                decompress(skin_interpolation_rate, 60.0),
+                custom_skin_id2,
+                blob_color,
+                team_id,
+                player_name,
+                to_font(font_id),
+                alias_colors,
+                account_id,
+                player_level,
+                clan_name,
+                clan_colors,
+                to_clan_role(clan_role),
+                click_type,
+            )
 
-        stream.close()
+        # ejects are fixed size records of an id, a position and a mass. each field is
+        # decoded for every record at once, straight out of the packet buffer.
+        eject_end = pos + eject_count * _EJECT_RECORD_SIZE
+        eject_ids = struct.unpack(f">{eject_count}b", data[pos:eject_end:_EJECT_RECORD_SIZE])
+        eject_xs, _ = decompress_3_many(map_size, eject_count, view, pos + 1, _EJECT_RECORD_SIZE)
+        eject_ys, _ = decompress_3_many(map_size, eject_count, view, pos + 4, _EJECT_RECORD_SIZE)
+        eject_masses, _ = decompress_3_many(500000.0, eject_count, view, pos + 7, _EJECT_RECORD_SIZE)
+        eject_objects = [
+            NetPlayerEject(
+                eject_id,
+                CompressedFloat(xpos, map_size),
+                CompressedFloat(ypos, map_size),
+                CompressedFloat(mass, 500000.0),
+            )
+            for eject_id, xpos, ypos, mass in zip(
+                eject_ids,
+                eject_xs,
+                eject_ys,
+                eject_masses,
+                strict=True,
+            )
+        ]
+        pos = eject_end
+
+        # dots are a flat run of (xpos, ypos) pairs, decode them all at once
+        dot_positions, pos = decompress_3_many(map_size, dot_count * 2, view, pos)
+
+        # items are fixed size records of a type byte followed by a position, decoded the same way as ejects
+        item_end = pos + item_count * _ITEM_RECORD_SIZE
+        item_types = data[pos:item_end:_ITEM_RECORD_SIZE]
+        item_xs, _ = decompress_3_many(map_size, item_count, view, pos + 1, _ITEM_RECORD_SIZE)
+        item_ys, _ = decompress_3_many(map_size, item_count, view, pos + 4, _ITEM_RECORD_SIZE)
+        item_objects = [
+            NetGameItem(item_id, to_item(item_type), CompressedFloat(xpos, map_size), CompressedFloat(ypos, map_size))
+            for item_id, item_type, xpos, ypos in zip(
+                range(item_id_offset, item_id_offset + item_count),
+                item_types,
+                item_xs,
+                item_ys,
+                strict=True,
+            )
+        ]
 
         return await InternalCallbacks.on_game_data(
             client,
@@ -349,14 +562,38 @@ class GameData(Packet):
                 item_count,
                 player_objects,
                 eject_objects,
-                dot_objects,
                 item_objects,
+                dot_ids=range(dot_id_offset, dot_id_offset + dot_count),
+                dot_xs=dot_positions[0::2],
+                dot_ys=dot_positions[1::2],
             )
         )
 
 
+def _game_data_to_jsonable(o: GameData) -> dict[str, Any]:
+    # serialize the dots as dot_objects instead of the columns, the same shape as before they were split up
+    return {name: _to_jsonable(getattr(o, name)) for name in _GAME_DATA_JSON_FIELDS}
+
+
+_GAME_DATA_JSON_FIELDS = (
+    "packet_type",
+    "public_id",
+    "map_size",
+    "player_count",
+    "eject_count",
+    "dot_id_offset",
+    "dot_count",
+    "item_id_offset",
+    "item_count",
+    "player_objects",
+    "eject_objects",
+    "dot_objects",
+    "item_objects",
+)
+_JSON_CONVERTERS[GameData] = _game_data_to_jsonable
+
+
 @dataclass
-@PacketHandler.register_handler(PacketType.GAME_CHAT_MESSAGE)
 class GameChatMessage(Packet):
     """
     Represents a game chat packet in the game.
@@ -377,53 +614,35 @@ class GameChatMessage(Packet):
     account_id: int = -1  # 4 bytes
 
     def write(self, client: Client) -> bytes:
-        stream = SerializingStream(byteorder=ByteOrder.NETWORK_ENDIAN)
+        buf = bytearray(_CHAT_HEADER.pack(self.packet_type.value, client.server_data.public_id & 0xFFFFFFFF))
 
-        stream.write_int8(self.packet_type.value)
-        stream.write_int32(client.server_data.public_id)
-        stream.write(self.alias.encode())
-        stream.write(self.message.encode())
+        self.alias.encode_into(buf)
+        self.message.encode_into(buf)
 
         # hardcoded account id, unknown bool, and message id
-        stream.write_int32(-1)
-        stream.write_bool(False)
-        stream.write_int64(0)
-
-        stream.write(self.alias_colors.encode())
-        stream.write_bool(self.show_broadcast_bubble)
-        stream.write_int8(self.alias_font.value)
-        stream.write_int32(client.server_data.client_id)
-
-        # hardcoded pair of bools
-        stream.write_bool(False)
-        stream.write_bool(False)
+        buf += _GAME_CHAT_MESSAGE_INFO_ENCODED
 
-        data = stream.bytes()
+        self.alias_colors.encode_into(buf)
+        buf += _GAME_CHAT_MESSAGE_STYLE.pack(self.show_broadcast_bubble, self.alias_font.value)
 
-        stream.close()
+        # hardcoded pair of bools after the client id
+        buf += _GAME_CHAT_MESSAGE_TAIL.pack(client.server_data.client_id & 0xFFFFFFFF, False, False)
 
-        return data
+        return bytes(buf)
 
     @classmethod
     async def read(cls, client: Client, packet_type: PacketType, data: bytes) -> GameChatMessage:
-        stream = DeserializingStream(data, byteorder=ByteOrder.NETWORK_ENDIAN)
-
-        # skip over the packet type byte
-        stream.read_int8()
-        stream.read_int32()  # public id, unused
-
-        alias = MUTF8String.from_stream(stream)
-        message = MUTF8String.from_stream(stream)
-        account_id = stream.read_int32()
+        view = memoryview(data)
 
-        stream.read_bool()  # unknown bool
-        stream.read_int64()  # message id, unused, only used in single player games
+        # skip over the packet type byte and the unused public id
+        alias, pos = MUTF8String.from_buffer(view, _CHAT_HEADER_SIZE)
+        message, pos = MUTF8String.from_buffer(view, pos)
 
-        alias_colors = VariableLengthArray.from_stream(1, stream)
-        show_broadcast_bubble = stream.read_bool()
-        alias_font = Font(stream.read_int8())
+        # the unknown bool and message id are unused, the latter is only used in single player games
+        account_id, _, _ = _GAME_CHAT_MESSAGE_INFO.unpack_from(view, pos)
 
-        stream.close()
+        alias_colors, pos = VariableLengthArray.from_buffer(1, view, pos + _GAME_CHAT_MESSAGE_INFO.size)
+        show_broadcast_bubble, alias_font = _GAME_CHAT_MESSAGE_STYLE.unpack_from(view, pos)
 
         return await InternalCallbacks.on_game_chat_message(
             client,
@@ -433,7 +652,7 @@ class GameChatMessage(Packet):
                 message,
                 alias_colors,
                 show_broadcast_bubble,
-                alias_font,
+                Font(alias_font),
                 account_id,
             )
         )
@@ -442,7 +661,6 @@ class GameChatMessage(Packet):
 # clan chat messages are the same as game chat messages, only difference is
 # the packet type and the redaction of other fields.
 @dataclass
-@PacketHandler.register_handler(PacketType.CLAN_CHAT_MESSAGE)
 class ClanChatMessage(Packet):
     """
     Represents a clan chat packet.
@@ -462,53 +680,36 @@ class ClanChatMessage(Packet):
     alias_colors: VariableLengthArray | None = None
 
     def write(self, client: Client) -> bytes:
-        stream = SerializingStream(byteorder=ByteOrder.NETWORK_ENDIAN)
+        buf = bytearray(_CHAT_HEADER.pack(self.packet_type.value, client.server_data.public_id & 0xFFFFFFFF))
+        buf += _EMPTY_MUTF8_ENCODED
 
-        stream.write_int8(self.packet_type.value)
-        stream.write_int32(client.server_data.public_id)
-        stream.write(MUTF8String.from_py_string("").encode())
-        stream.write(self.message.encode())
+        self.message.encode_into(buf)
 
         # hardcoded values
-        stream.write_int8(0)
-        stream.write_int32(-1)
-        stream.write_int64(0)
-        stream.write_int8(0)
+        buf += _CLAN_CHAT_MESSAGE_INFO_ENCODED
+        buf += _CLAN_CHAT_MESSAGE_TAIL.pack(0, client.server_data.client_id & 0xFFFFFFFF, False)
 
-        stream.write_int32(client.server_data.client_id)
-        stream.write_bool(False)
-
-        data = stream.bytes()
-
-        stream.close()
-
-        return data
+        return bytes(buf)
 
     @classmethod
     async def read(cls, client: Client, packet_type: PacketType, data: bytes) -> ClanChatMessage:
-        stream = DeserializingStream(data, byteorder=ByteOrder.NETWORK_ENDIAN)
-
-        # skip over the packet type byte
-        stream.read_int8()
-        stream.read_int32()  # public id, unused
-
-        alias = MUTF8String.from_stream(stream)
-        message = MUTF8String.from_stream(stream)
-        role = ClanRole(stream.read_int8())
-        account_id = stream.read_int32()
+        view = memoryview(data)
 
-        stream.read_int64()  # message id, unused, only used in single player games
+        # skip over the packet type byte and the unused public id
+        alias, pos = MUTF8String.from_buffer(view, _CHAT_HEADER_SIZE)
+        message, pos = MUTF8String.from_buffer(view, pos)
 
-        alias_colors = VariableLengthArray.from_stream(1, stream)
+        # message id is unused, only used in single player games
+        role, account_id, _ = _CLAN_CHAT_MESSAGE_INFO.unpack_from(view, pos)
 
-        stream.close()
+        alias_colors, _ = VariableLengthArray.from_buffer(1, view, pos + _CLAN_CHAT_MESSAGE_INFO.size)
 
         return await InternalCallbacks.on_clan_chat_message(
             client,
             cls(
                 packet_type,
                 message,
-                role,
+                ClanRole(role),
                 account_id,
                 alias,
                 alias_colors,
@@ -517,51 +718,47 @@ class ClanChatMessage(Packet):
 
 
 @dataclass
-@PacketHandler.register_handler(PacketType.CONTROL)
 class Control(Packet):
     """
     Represents a control packet that contains information about the player's control inputs.
 
     Attributes:
-        angle (float): The angle of the player, compressed to 2 bytes and clamped to the range 0.0 - 2pi.
+        angle (float): The angle of the player, compressed to 2 bytes and wrapped modulo 2pi.
         speed (float): The speed of the player, compressed to 1 byte and clamped to the range 0.0 - 1.0.
         flags (ControlFlags): The control flags, represented as a ControlFlags enum.
         aspect_ratio (float): The aspect ratio of the screen, compressed to 1 byte and clamped to the range 1.0 - 3.0.
     """
 
-    angle: float  # compressed to 2 bytes, clamped to 0.0 - 2pi
+    angle: float  # compressed to 2 bytes, wrapped modulo 2pi
     speed: float  # compressed to 1 byte, clamped to 0.0 - 1.0
     flags: ControlFlags  # 1 byte
     aspect_ratio: float  # compressed to 1 byte, clamped to 1.0 - 3.0
 
     def write(self, client: Client) -> bytes:
-        stream = SerializingStream(byteorder=ByteOrder.NETWORK_ENDIAN)
-
-        angle = CompressedFloat(self.angle, math.pi * 2)
-        speed = CompressedFloat(self.speed, 1.0)
-        aspect_ratio = CompressedFloat(self.aspect_ratio, 3.0)
-
-        stream.write_int8(self.packet_type.value)
-        stream.write_int32(client.server_data.public_id)
-        stream.write_int16(angle.compress())
-        stream.write_int8(speed.compress_1_clamp(0.0))
-        stream.write_int8(client.control_ticks)
-        stream.write_int8(self.flags.value)
-        stream.write_int8(client.game_player.index)  # type: ignore
-        stream.write_int32(client.server_data.client_id)
-        stream.write_int8(aspect_ratio.compress_1_clamp(1.0))
+        # compression is done inline rather than through CompressedFloat, as this is sent every tick.
+        # the angle wraps around instead of clamping, a negative angle is the same as its positive turn.
+        angle = int((self.angle * 65535.0) / _TWO_PI) & 0xFFFF
+        speed = int(min(max(self.speed, 0.0), 1.0) * 255.0)
+        aspect_ratio = int(((min(max(self.aspect_ratio, 1.0), 3.0) - 1.0) * 255.0) / 2.0)
+
+        data = _CONTROL.pack(
+            self.packet_type.value,
+            client.server_data.public_id & 0xFFFFFFFF,
+            angle,
+            speed,
+            client.control_ticks & 0xFF,
+            self.flags.value & 0xFF,
+            client.game_player.index & 0xFF,  # type: ignore
+            client.server_data.client_id & 0xFFFFFFFF,
+            aspect_ratio,
+        )
 
         client.control_ticks = (client.control_ticks + 1) % 0xff
 
-        data = stream.bytes()
-
-        stream.close()
-
         return data
 
 
 @dataclass
-@PacketHandler.register_handler(PacketType.KEEP_ALIVE)
 class KeepAlive(Packet):
     """
     Represents a KeepAlive packet.
@@ -579,28 +776,19 @@ class KeepAlive(Packet):
     client_id: int  # 4 bytes
 
     def write(self, client: Client) -> bytes:  # noqa: ARG002
-        stream = SerializingStream(byteorder=ByteOrder.NETWORK_ENDIAN)
-
-        stream.write_int8(self.packet_type.value)
-        stream.write_int32(self.public_id)
-        stream.write_int32(self.private_id)
-
         # by default, java.io.DataOutputStream writes integers in big endian format.
         # for some reason unknown to me, the server expects the region's server ip
         # to be in little endian format, so we must manually encode it as such.
-        stream.write(self.server_ip[::-1])
-
-        stream.write_int32(self.client_id)
-
-        data = stream.bytes()
-
-        stream.close()
-
-        return data
+        return _KEEP_ALIVE.pack(
+            self.packet_type.value,
+            self.public_id & 0xFFFFFFFF,
+            self.private_id & 0xFFFFFFFF,
+            self.server_ip[::-1],
+            self.client_id & 0xFFFFFFFF,
+        )
 
 
 @dataclass
-@PacketHandler.register_handler(PacketType.DISCONNECT)
 class Disconnect(Packet):
     """
     Represents a packet used to disconnect a client from the server.
@@ -615,20 +803,15 @@ class Disconnect(Packet):
     client_id: int
 
     def write(self, client: Client) -> bytes:  # noqa: ARG002
-        stream = SerializingStream(byteorder=ByteOrder.NETWORK_ENDIAN)
-
-        stream.write_int8(self.packet_type.value)
-        stream.write_int32(self.public_id)
-        stream.write_int32(self.private_id)
-        stream.write_int32(self.client_id)
-
-        data = stream.bytes()
-
-        return data
+        return _DISCONNECT.pack(
+            self.packet_type.value,
+            self.public_id & 0xFFFFFFFF,
+            self.private_id & 0xFFFFFFFF,
+            self.client_id & 0xFFFFFFFF,
+        )
 
 
 @dataclass
-@PacketHandler.register_handler(PacketType.CONNECT_REQUEST_3)
 class ConnectRequest3(Packet):
     """
     Represents a packet used to request a connection to the Nebulous.io game server.
@@ -703,11 +886,6 @@ class ConnectRequest3(Packet):
     sc_bits: VariableLengthArray  # length size is 2 bytes
 
     def write(self, client: Client) -> bytes:
-        stream = SerializingStream(byteorder=ByteOrder.NETWORK_ENDIAN)
-
-        # write packet type
-        stream.write_int8(self.packet_type.value)
-
         # a new client id has to be generated for each new connection
         while client.server_data.client_id == 0:
             client.server_data.client_id = client.rng.nextInt()
@@ -715,70 +893,80 @@ class ConnectRequest3(Packet):
         rng_seed = client.rng.nextLong()
         server_rng = JavaRNG(rng_seed)
 
-        # public id is always 0 for the first packet (CONNECT_REQUEST_3)
-        stream.write_int32(0)
-
-        stream.write_int64(rng_seed)
-        stream.write_int16(APP_VERSION)
-        stream.write_int32(client.server_data.client_id)
-        stream.write_int8(self.game_mode.value)
-        stream.write_int8(self.game_difficulty.value)
-        stream.write_int32(self.game_id)
-        stream.write(self.ticket.encode())
-        stream.write_int8(self.online_mode.value)
-        stream.write_bool(self.mayhem)
-        stream.write_int16(self.skin1.value)
-        stream.write_int8(self.eject_skin)
-        stream.write(self.alias.encode())
-        stream.write_int32(self.custom_skin)
-        stream.write(self.alias_colors.encode())
-        stream.write_int8(self.pet_id)
-        stream.write_int32(self.blob_color)
-        stream.write(self.pet_name.encode())
-        stream.write_int8(self.hat_type)
-        stream.write_int32(self.custom_pet)
-        stream.write_int8(self.halo_type)
-        stream.write_int8(self.pet_id2)
-        stream.write(self.pet_name2.encode())
-        stream.write_int32(self.custom_pet2)
-        stream.write_int32(self.custom_particle)
-        stream.write_int8(self.particle_type)
-        stream.write_int8(self.alias_font.value)
-        stream.write(self.level_colors.encode())
-        stream.write_int8(self.alias_anim.value)
-        stream.write_int16(self.skin2.value)
-        stream.write_int16(self.skin_interpolation_rate.compress())
-        stream.write_int32(self.custom_skin2)
-        stream.write_int64(int(time.time() * 1000))
-        stream.write(self.sc_bits.encode())
+        # the fixed size header, up to the ticket. public id is always 0 for the first packet (CONNECT_REQUEST_3)
+        header = _CONNECT_REQUEST_3_HEADER.pack(
+            self.packet_type.value,
+            0,
+            rng_seed & 0xFFFFFFFFFFFFFFFF,
+            APP_VERSION & 0xFFFF,
+            client.server_data.client_id & 0xFFFFFFFF,
+            self.game_mode.value,
+            self.game_difficulty.value,
+            self.game_id & 0xFFFFFFFF,
+        )
+        packet_bytes = bytearray(header)
+
+        # the rest of the packet is fixed size runs in between the strings and arrays
+        self.ticket.encode_into(packet_bytes)
+        packet_bytes += _CONNECT_REQUEST_3_SKIN.pack(
+            self.online_mode.value,
+            self.mayhem,
+            self.skin1.value,
+            self.eject_skin & 0xFF,
+        )
+        self.alias.encode_into(packet_bytes)
+        packet_bytes += _UINT32.pack(self.custom_skin & 0xFFFFFFFF)
+        self.alias_colors.encode_into(packet_bytes)
+        packet_bytes += _CONNECT_REQUEST_3_PET.pack(self.pet_id & 0xFF, self.blob_color & 0xFFFFFFFF)
+        self.pet_name.encode_into(packet_bytes)
+        packet_bytes += _CONNECT_REQUEST_3_COSMETICS.pack(
+            self.hat_type & 0xFF,
+            self.custom_pet & 0xFFFFFFFF,
+            self.halo_type & 0xFF,
+            self.pet_id2 & 0xFF,
+        )
+        self.pet_name2.encode_into(packet_bytes)
+        packet_bytes += _CONNECT_REQUEST_3_PARTICLES.pack(
+            self.custom_pet2 & 0xFFFFFFFF,
+            self.custom_particle & 0xFFFFFFFF,
+            self.particle_type & 0xFF,
+            self.alias_font.value,
+        )
+        self.level_colors.encode_into(packet_bytes)
+        packet_bytes += _CONNECT_REQUEST_3_APPEARANCE.pack(
+            self.alias_anim.value,
+            self.skin2.value,
+            self.skin_interpolation_rate.compress() & 0xFFFF,
+            self.custom_skin2 & 0xFFFFFFFF,
+            time.time_ns() // 1_000_000,
+        )
+        self.sc_bits.encode_into(packet_bytes)
 
         # before returning, some byte shuffling must be done
-        packet_bytes = bytearray(stream.bytes())
-        indices = []
-
-        for i in range(len(packet_bytes) - 14, 0, -1):
-            indices.append((i, server_rng.nextInt(i + 1)))
-
-        for pair in indices:
-            x = pair[0] + 13
-            a = packet_bytes[x]
-            y = pair[1] + 13
-            packet_bytes[x] = packet_bytes[y]
-            packet_bytes[y] = a
+        _shuffle_bytes(packet_bytes, server_rng, 13)
 
-        stream.close()
-
-        # check that the packet header hasnt been altered by the shuffling
-        if packet_bytes[0] != PacketType.CONNECT_REQUEST_3.value:
+        # check that the packet type, public id and seed havent been altered by the shuffling.
+        # the shuffle never reaches below index 13, so this is skipped when running with -O.
+        if __debug__ and memoryview(packet_bytes)[:13] != header[:13]:
             raise ValueError("Packet header has been corrupted")
 
-        if packet_bytes[1:5] != b"\x00\x00\x00\x00":
-            raise ValueError("Packet header has been corrupted")
+        return bytes(packet_bytes)
 
-        if packet_bytes[5:13] != rng_seed.to_bytes(8, byteorder="big", signed=True):
-            raise ValueError("Packet header has been corrupted")
 
-        return bytes(packet_bytes)
+# the packet handler dispatch table, registered in one place once every packet is defined
+_PACKET_HANDLERS: dict[PacketType, type[Packet]] = {
+    PacketType.CONNECT_RESULT_2: ConnectResult2,
+    PacketType.GAME_DATA: GameData,
+    PacketType.GAME_CHAT_MESSAGE: GameChatMessage,
+    PacketType.CLAN_CHAT_MESSAGE: ClanChatMessage,
+    PacketType.CONTROL: Control,
+    PacketType.KEEP_ALIVE: KeepAlive,
+    PacketType.DISCONNECT: Disconnect,
+    PacketType.CONNECT_REQUEST_3: ConnectRequest3,
+}
+
+for _packet_type, _handler in _PACKET_HANDLERS.items():
+    PacketHandler.handlers[_packet_type.value] = _handler
 
 
 __all__ = [
@@ -0,0 +1,23 @@
+import os
+from pathlib import Path
+
+import pytest
+from dotenv import load_dotenv
+
+from nebulous.game.account import Account, ServerRegions
+
+# load the secrets into the environment once per session. values already set in
+# the environment (e.g. by ci) take precedence over the file.
+load_dotenv(Path(__file__).parent.parent / ".env.secrets", override=False)
+
+
+# accounts sign in and fetch their initial state on construction, so build each
+# one once per session and share it (and its pooled connections) across tests
+@pytest.fixture(scope="session")
+def us_east_no_account() -> Account:
+    return Account.no_account(ServerRegions.US_EAST)
+
+
+@pytest.fixture(scope="session")
+def us_east_ticketed() -> Account:
+    return Account(os.environ.get("TICKET", ""), ServerRegions.US_EAST)
@@ -1,21 +1,29 @@
+import asyncio
 import logging
+import threading
 import time
+from types import SimpleNamespace
 
-from dotenv import dotenv_values
+import pytest
 
-from nebulous.game.account import Account, APIPlayer, ServerRegions
+from nebulous.game import account as account_api
+from nebulous.game.account import Account, APIPlayer, Endpoints
+from nebulous.game.exceptions import InvalidUserIDError
 from nebulous.game.natives import xp2level
 
-secrets = dotenv_values(".env.secrets")
 logger = logging.getLogger("Account API Tests")
 logger.setLevel(logging.INFO)
 
 
-def test_fetch_other_player():
-    account = Account.no_account(ServerRegions.US_EAST)
+async def fetch_profile_and_stats(player: APIPlayer):
+    # the two requests are independent, so run them side by side
+    return await asyncio.gather(player.aget_profile(), player.aget_stats())
+
+
+def test_fetch_other_player(us_east_no_account: Account):
+    account = us_east_no_account
     player = APIPlayer.from_account_id(account, 4)
-    player_profile = player.get_profile()
-    player_stats = player.get_stats()
+    player_profile, player_stats = asyncio.run(fetch_profile_and_stats(player))
 
     player_xp = player_stats.general_stats.xp
 
@@ -35,8 +43,8 @@ def test_fetch_other_player():
     time.sleep(1.5)
 
 
-def test_fetch_self():
-    account = Account(secrets.get("TICKET", ""), ServerRegions.US_EAST)  # type: ignore
+def test_fetch_self(us_east_ticketed: Account):
+    account = us_east_ticketed
     player = account.player_obj
 
     if player is None:
@@ -44,8 +52,7 @@ def test_fetch_self():
 
         return
 
-    player_profile = player.get_profile()
-    player_stats = player.get_stats()
+    player_profile, player_stats = asyncio.run(fetch_profile_and_stats(player))
 
     player_xp = player_stats.general_stats.xp
 
@@ -70,17 +77,201 @@ def test_fetch_self():
 
         return
 
+    friend_ids = [friend.account_id for friend in friends]
+    friend_profiles = APIPlayer.get_profiles_bulk(account, friend_ids)
+    friend_stats = APIPlayer.get_stats_bulk(account, friend_ids)
+
     for friend in friends:
-        friend_profile = friend.get_profile()
-        friend_stats = friend.get_stats()
-        friend_xp = friend_stats.general_stats.xp
+        friend_profile = friend_profiles[friend.account_id]
+        friend_stat = friend_stats[friend.account_id]
+        friend_xp = friend_stat.general_stats.xp
 
-        logger.info(f"Friend: {friend_stats.account_name}")
+        logger.info(f"Friend: {friend_stat.account_name}")
         logger.info(f"Level: {xp2level(friend_xp)}")
         logger.info(f"Current XP: {friend_xp}")
         logger.info(f"Account bio: {friend_profile.bio}")
         logger.info(f"BFF: {friend.bff}")
         logger.info(f"Last seen: {friend.last_played_utc}\n")
 
-        logger.info("Cooldown for 1.5 seconds...")
-        time.sleep(1.5)  # don't spam the API
+    logger.info("Cooldown for 1.5 seconds...")
+    time.sleep(1.5)  # don't spam the API
+
+
+def offline_account(monkeypatch: pytest.MonkeyPatch, cache_players: bool) -> tuple[Account, list]:
+    # skip __init__, which signs in over the network, and answer requests from a stub instead
+    account = Account.__new__(Account)
+    account.cache_players = cache_players
+    account._player_cache = {}
+    requests = []
+
+    def request_endpoint(endpoint: Endpoints, data: dict) -> dict:
+        requests.append((endpoint, data))
+
+        return {"request": len(requests), "colors": [1, 2, 3]}
+
+    monkeypatch.setattr(account, "request_endpoint", request_endpoint)
+
+    return account, requests
+
+
+def test_player_cache(monkeypatch: pytest.MonkeyPatch):
+    now = [1000.0]
+    monkeypatch.setattr(account_api.time, "monotonic", lambda: now[0])
+
+    account, requests = offline_account(monkeypatch, cache_players=True)
+
+    first = account._request_player_endpoint(Endpoints.GET_PLAYER_PROFILE, "accountID", 4)
+    first["colors"].append(4)
+
+    # a hit doesn't refetch, and hands out a copy that the earlier caller's changes didn't reach
+    now[0] += 179.0
+    hit = account._request_player_endpoint(Endpoints.GET_PLAYER_PROFILE, "accountID", 4)
+
+    assert hit == {"request": 1, "colors": [1, 2, 3]}
+    assert len(requests) == 1
+
+    hit["colors"].clear()
+
+    assert account._request_player_endpoint(Endpoints.GET_PLAYER_PROFILE, "accountID", 4)["colors"] == [1, 2, 3]
+
+    # the profile and stats of a player are cached separately
+    account._request_player_endpoint(Endpoints.GET_PLAYER_STATS, "AccountID", 4)
+
+    assert requests[-1] == (Endpoints.GET_PLAYER_STATS, {"AccountID": 4})
+
+    # the profile expires, the stats were cached later and are still fresh
+    now[0] += 2.0
+
+    assert account._request_player_endpoint(Endpoints.GET_PLAYER_PROFILE, "accountID", 4)["request"] == 3
+    assert account._request_player_endpoint(Endpoints.GET_PLAYER_STATS, "AccountID", 4)["request"] == 2
+
+    # invalidate drops both endpoints for the player
+    account.invalidate_player(4)
+
+    assert account._request_player_endpoint(Endpoints.GET_PLAYER_PROFILE, "accountID", 4)["request"] == 4
+    assert account._request_player_endpoint(Endpoints.GET_PLAYER_STATS, "AccountID", 4)["request"] == 5
+
+
+def test_player_cache_disabled(monkeypatch: pytest.MonkeyPatch):
+    account, requests = offline_account(monkeypatch, cache_players=False)
+
+    for _ in range(3):
+        account._request_player_endpoint(Endpoints.GET_PLAYER_PROFILE, "accountID", 4)
+
+    assert requests == [(Endpoints.GET_PLAYER_PROFILE, {"accountID": 4})] * 3
+    assert account._player_cache == {}
+
+
+class FakeClock:
+    """
+    Stands in for time.monotonic and time.sleep. Sleeping advances the clock instead of blocking.
+    """
+
+    def __init__(self, on_sleep=None):
+        self.now = 0.0
+        self.on_sleep = on_sleep
+        self._lock = threading.Lock()
+
+    def monotonic(self) -> float:
+        with self._lock:
+            return self.now
+
+    def sleep(self, seconds: float):
+        if self.on_sleep is not None:
+            self.on_sleep()
+
+        # like a real sleep, the clock always moves on, even when the wait rounds down to nothing
+        with self._lock:
+            self.now += max(seconds, 1e-6)
+
+
+def test_rate_limiter(monkeypatch: pytest.MonkeyPatch):
+    def check_unlocked():
+        # the other workers must be able to take a token while this one waits
+        assert not limiter._lock.locked()
+
+    clock = FakeClock(check_unlocked)
+    monkeypatch.setattr(account_api.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(account_api.time, "sleep", clock.sleep)
+
+    limiter = account_api._RateLimiter(5)
+    times = []
+
+    for _ in range(15):
+        limiter.acquire()
+        times.append(clock.now)
+
+    # a burst of 5, then one every 1/5th of a second
+    assert times[:5] == [0.0] * 5
+    assert times[5:] == pytest.approx([(i - 4) / 5 for i in range(5, 15)], abs=1e-5)
+
+
+def test_fetch_many_rate(monkeypatch: pytest.MonkeyPatch):
+    clock = FakeClock()
+    monkeypatch.setattr(account_api.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(account_api.time, "sleep", clock.sleep)
+
+    times = []
+
+    def fetch(account_id: int) -> int:
+        times.append(clock.monotonic())
+
+        return account_id * 2
+
+    account_ids = list(range(30))
+
+    assert APIPlayer._fetch_many(fetch, account_ids) == {account_id: account_id * 2 for account_id in account_ids}
+
+    # no more than the burst of 5 plus 5 per second, however the workers interleave
+    times.sort()
+
+    for i, fetched_at in enumerate(times[5:], 5):
+        assert fetched_at >= (i - 4) / 5 - 1e-9
+
+
+def test_fetch_many(monkeypatch: pytest.MonkeyPatch):
+    clock = FakeClock()
+    monkeypatch.setattr(account_api.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(account_api.time, "sleep", clock.sleep)
+
+    fetched = []
+    lock = threading.Lock()
+
+    def fetch(account_id: int) -> str:
+        with lock:
+            fetched.append(account_id)
+
+        return f"player {account_id}"
+
+    account = SimpleNamespace(get_player_profile=fetch, get_player_stats=fetch)
+
+    # keys keep the order the ids were given in, and repeated ids are only fetched once
+    for fetch_bulk in (APIPlayer.get_profiles_bulk, APIPlayer.get_stats_bulk):
+        fetched.clear()
+        players = fetch_bulk(account, iter([9, 3, 9, 0, 12, 3]))  # type: ignore[arg-type]
+
+        assert list(players.items()) == [(9, "player 9"), (3, "player 3"), (0, "player 0"), (12, "player 12")]
+        assert sorted(fetched) == [0, 3, 9, 12]
+
+    assert APIPlayer._fetch_many(fetch, []) == {}
+
+    with pytest.raises(InvalidUserIDError):
+        APIPlayer._fetch_many(fetch, [1, -1])
+
+
+def test_fetch_many_error(monkeypatch: pytest.MonkeyPatch):
+    clock = FakeClock()
+    monkeypatch.setattr(account_api.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(account_api.time, "sleep", clock.sleep)
+
+    def fetch(account_id: int) -> int:
+        if account_id in (7, 2):
+            raise LookupError(account_id)
+
+        return account_id
+
+    # the first failure in account id order is raised, not the first to happen
+    with pytest.raises(LookupError) as error:
+        APIPlayer._fetch_many(fetch, [5, 7, 1, 2])
+
+    assert error.value.args == (7,)
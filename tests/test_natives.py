@@ -0,0 +1,84 @@
+from datastream import ByteOrder, DeserializingStream
+
+from nebulous.game.natives import CompressedFloat, MUTF8String, VariableLengthArray, decompress_3_many, xp2level
+
+
+def test_mutf8_encode():
+    string = MUTF8String.from_py_string("héllo")
+
+    assert string.length == 6
+    assert string.encode() == b"\x00\x06h\xc3\xa9llo"
+
+    string.value = "abc"
+
+    assert string.length == 3
+    assert string.encode() == b"\x00\x03abc"
+
+
+def test_xp2level():
+    for xp in (*range(0, 20000, 7), 499, 500, 2000, 10**7, 500 * 1023 * 1023, 10**12):
+        assert xp2level(xp) == int((xp / 500) ** 0.5) + 1
+
+    assert xp2level(-1) == 1
+
+
+def test_decompress_3_many():
+    data = b"\xaa" + bytes(range(0, 252, 3)) + b"\xff\xff\xff"
+    count = (len(data) - 1) // 3
+
+    stream = DeserializingStream(data[1:], byteorder=ByteOrder.NETWORK_ENDIAN)
+    expected = [CompressedFloat.from_3(703.5, stream).value for _ in range(count)]
+
+    values, pos = decompress_3_many(703.5, count, memoryview(data), 1)
+
+    assert values == expected
+    assert pos == len(data)
+
+    # the same values spread out over 5 byte records, one per record after a 2 byte prefix
+    records = b"".join(b"\x01\x02" + data[i:i + 3] for i in range(1, len(data), 3))
+    values, pos = decompress_3_many(703.5, count, memoryview(records), 2, 5)
+
+    assert values == expected
+    assert pos == len(records)
+
+
+def test_from_buffer_matches_from_stream():
+    data = b"\x00\x06h\xc3\xa9llo" + b"\x03\x01\xff\x7f" + b"\x80\x00" + b"\x12\x34\x56" + b"\xc0"
+    view = memoryview(data)
+    stream = DeserializingStream(data, byteorder=ByteOrder.NETWORK_ENDIAN)
+
+    string, pos = MUTF8String.from_buffer(view, 0)
+    assert string == MUTF8String.from_stream(stream)
+
+    array, pos = VariableLengthArray.from_buffer(1, view, pos)
+    assert array == VariableLengthArray.from_stream(1, stream)
+
+    compressed, pos = CompressedFloat.from_buffer(60.0, view, pos)
+    assert compressed == CompressedFloat.from_stream(60.0, stream)
+
+    compressed, pos = CompressedFloat.from_3_buffer(703.5, view, pos)
+    assert compressed == CompressedFloat.from_3(703.5, stream)
+
+    compressed, pos = CompressedFloat.from_1_clamped_buffer(1.0, 3.0, view, pos)
+    assert compressed == CompressedFloat.from_1_clamped(1.0, 3.0, stream)
+
+    assert pos == len(data) == stream.tell()
+
+
+def test_encode_into():
+    buf = bytearray(b"\xaa")
+
+    MUTF8String.from_py_string("abc").encode_into(buf)
+    VariableLengthArray.from_py_list(2, [1, 2, -1]).encode_into(buf)
+    CompressedFloat(30.0, 60.0).encode_into(buf)
+
+    assert buf == b"\xaa\x00\x03abc\x00\x03\x01\x02\xff\x7f\xff"
+    assert VariableLengthArray.from_py_list(1, [1, 2]).encode() == b"\x02\x01\x02"
+
+
+def test_variable_length_array_is_unsigned():
+    stream = DeserializingStream(b"\x80" + bytes(range(0x80, 0x100)), byteorder=ByteOrder.NETWORK_ENDIAN)
+    array = VariableLengthArray.from_stream(1, stream)
+
+    assert array.values == bytes(range(0x80, 0x100))
+    assert array.encode() == b"\x80" + bytes(range(0x80, 0x100))
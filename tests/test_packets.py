@@ -0,0 +1,360 @@
+import asyncio
+import json
+import math
+import socket
+import struct
+from types import SimpleNamespace
+
+import pytest
+from javarandom import Random as JavaRNG
+
+from nebulous.game import InternalCallbacks, packets
+from nebulous.game.enums import (
+    ClanRole,
+    ControlFlags,
+    EjectSkinType,
+    Font,
+    GameDifficulty,
+    GameMode,
+    HaloType,
+    HatType,
+    Item,
+    NameAnimation,
+    OnlineStatus,
+    PacketType,
+    ParitcleType,
+    PetType,
+    Skin,
+)
+from nebulous.game.models import ServerData
+from nebulous.game.models.netobjects import NetGameDot, NetGameItem, NetPlayer, NetPlayerEject
+from nebulous.game.natives import CompressedFloat, MUTF8String, VariableLengthArray
+from nebulous.game.packets import (
+    ClanChatMessage,
+    ConnectRequest3,
+    Control,
+    Disconnect,
+    GameData,
+    KeepAlive,
+    _shuffle_bytes,
+)
+
+
+class SequenceRNG:
+    """
+    Stands in for java.util.Random, returning a fixed sequence of values from nextInt.
+    """
+
+    def __init__(self, values: list[int]):
+        self.values = iter(values)
+
+    def nextInt(self, bound: int) -> int:  # noqa: N802
+        return next(self.values) % bound
+
+
+def test_shuffle_bytes_order():
+    data = bytearray(range(40))
+    values = [(i * 7919 + 13) for i in range(40)]
+
+    # plain fisher-yates over data[13:], swapping as each index is drawn
+    expected = bytearray(data)
+    rng = SequenceRNG(values)
+
+    for i in range(len(expected) - 14, 0, -1):
+        j = 13 + rng.nextInt(i + 1)
+        expected[13 + i], expected[j] = expected[j], expected[13 + i]
+
+    _shuffle_bytes(data, SequenceRNG(values), 13)
+
+    assert data == expected
+    assert data[:13] == bytes(range(13))
+
+
+@pytest.mark.parametrize("indent", [2, None, 4])
+def test_as_json_matches_without_orjson(monkeypatch: pytest.MonkeyPatch, indent: int | None):
+    packet = ClanChatMessage(PacketType.CLAN_CHAT_MESSAGE, MUTF8String.from_py_string("héllo 😀"))
+    with_orjson = packet.as_json(indent=indent)
+
+    monkeypatch.setattr(packets, "orjson", None)
+
+    assert packet.as_json(indent=indent) == with_orjson
+    assert "héllo 😀" in with_orjson
+
+
+def mutf8(value: str) -> bytes:
+    data = value.encode("utf-8")
+
+    return struct.pack(">H", len(data)) + data
+
+
+def uint24(value: int) -> bytes:
+    return value.to_bytes(3, byteorder="big")
+
+
+def from_3(max_range: float, value: int) -> CompressedFloat:
+    return CompressedFloat((max_range * value) / 1.6777215e7, max_range)
+
+
+def net_player_bytes(player_id: int, name: str, clan: str) -> bytes:
+    return (
+        struct.pack(">bhbiibh", player_id, 3, 2, 1001, 1002, 4, 55)
+        + mutf8("pet one")
+        + struct.pack(">bbbh", 1, 2, 5, 66)
+        + mutf8("")
+        + struct.pack(">iib", 1003, 1004, 3)
+        + bytes([2, 0x77, 0xC8])
+        + struct.pack(">bhHiib", 1, 2, 32768, 1005, -12345, 7)
+        + mutf8(name)
+        + bytes([3])
+        + bytes([3, 1, 2, 0xFF])
+        + struct.pack(">ih", 4242, 90)
+        + mutf8(clan)
+        + bytes([0])
+        + struct.pack(">bb", 3, 1)
+    )
+
+
+def expected_net_player(player_id: int, name: str, clan: str) -> NetPlayer:
+    return NetPlayer(
+        player_id,
+        Skin(3),
+        EjectSkinType(2),
+        1001,
+        1002,
+        PetType(4),
+        55,
+        MUTF8String.from_py_string("pet one"),
+        HatType(1),
+        HaloType(2),
+        PetType(5),
+        66,
+        MUTF8String.from_py_string(""),
+        1003,
+        1004,
+        ParitcleType(3),
+        VariableLengthArray(1, bytearray([0x77, 0xC8])),
+        NameAnimation(1),
+        Skin(2),
+        CompressedFloat((60.0 * 32768) / 65535.0, 60.0),
+        1005,
+        -12345,
+        7,
+        MUTF8String.from_py_string(name),
+        Font(3),
+        VariableLengthArray(1, bytearray([1, 2, 0xFF])),
+        4242,
+        90,
+        MUTF8String.from_py_string(clan),
+        VariableLengthArray(1, bytearray()),
+        ClanRole(3),
+        1,
+    )
+
+
+def test_game_data_read(monkeypatch: pytest.MonkeyPatch):
+    async def passthrough(client, packet):  # noqa: ARG001
+        return packet
+
+    monkeypatch.setattr(InternalCallbacks, "on_game_data", staticmethod(passthrough))
+
+    map_size = 703.5
+    # the dot id offset is above 0x7fff to check it is read unsigned
+    dot_id_offset = 0x8001
+    item_id_offset = 250
+    ejects = [(5, 100000, 0xFFFFFF, 12345), (-2, 0x123456, 1, 0xABCDEF), (127, 0, 0x800000, 7)]
+    dots = [(0, 0xFFFFFF), (0x010203, 0x040506), (0x7FFFFF, 0x800000)]
+    items = [(Item.PUMPKIN, 5000, 0xABCDEF), (Item.LEAF, 0xFEDCBA, 2), (Item.HEART, 3, 0x654321)]
+
+    data = (
+        struct.pack(
+            ">BifBBHHBB",
+            PacketType.GAME_DATA.value,
+            1234,
+            map_size,
+            2,
+            len(ejects),
+            dot_id_offset,
+            len(dots),
+            item_id_offset,
+            len(items),
+        )
+        + net_player_bytes(0, "Vector", "CLAN")
+        + net_player_bytes(1, "héllo", "")
+        + b"".join(
+            struct.pack(">b", eject_id) + uint24(xpos) + uint24(ypos) + uint24(mass)
+            for eject_id, xpos, ypos, mass in ejects
+        )
+        + b"".join(uint24(xpos) + uint24(ypos) for xpos, ypos in dots)
+        + b"".join(bytes([item.value]) + uint24(xpos) + uint24(ypos) for item, xpos, ypos in items)
+    )
+
+    packet = asyncio.run(GameData.read(None, PacketType.GAME_DATA, data))  # type: ignore
+
+    assert packet.packet_type == PacketType.GAME_DATA
+    assert (packet.public_id, packet.map_size, packet.player_count, packet.eject_count) == (1234, map_size, 2, 3)
+    assert (packet.dot_id_offset, packet.dot_count, packet.item_id_offset, packet.item_count) == (0x8001, 3, 250, 3)
+
+    assert packet.player_objects == [
+        expected_net_player(0, "Vector", "CLAN"),
+        expected_net_player(1, "héllo", ""),
+    ]
+    assert packet.eject_objects == [
+        NetPlayerEject(eject_id, from_3(map_size, xpos), from_3(map_size, ypos), from_3(500000.0, mass))
+        for eject_id, xpos, ypos, mass in ejects
+    ]
+    assert packet.dot_ids == range(0x8001, 0x8004)
+    assert packet.dot_xs == [from_3(map_size, xpos).value for xpos, _ in dots]
+    assert packet.dot_ys == [from_3(map_size, ypos).value for _, ypos in dots]
+    assert packet.dot_objects == [
+        NetGameDot(dot_id, from_3(map_size, xpos), from_3(map_size, ypos))
+        for dot_id, (xpos, ypos) in zip(range(0x8001, 0x8004), dots, strict=True)
+    ]
+    assert packet.item_objects == [
+        NetGameItem(item_id, item, from_3(map_size, xpos), from_3(map_size, ypos))
+        for item_id, (item, xpos, ypos) in zip(range(250, 253), items, strict=True)
+    ]
+
+    # the dot columns serialize as dot_objects, in the same place as before they were split up
+    serialized = json.loads(packet.as_json())
+
+    assert list(serialized)[-4:] == ["player_objects", "eject_objects", "dot_objects", "item_objects"]
+    assert serialized["dot_objects"] == [
+        {"dot_id": dot_id, "xpos": from_3(map_size, xpos).value, "ypos": from_3(map_size, ypos).value}
+        for dot_id, (xpos, ypos) in zip(range(0x8001, 0x8004), dots, strict=True)
+    ]
+
+
+def test_game_data_eject_and_item_columns(monkeypatch: pytest.MonkeyPatch):
+    async def passthrough(client, packet):  # noqa: ARG001
+        return packet
+
+    monkeypatch.setattr(InternalCallbacks, "on_game_data", staticmethod(passthrough))
+
+    # every byte of every record is distinct, so a column read with the wrong
+    # stride or start offset picks up bytes from a neighbouring field or record
+    map_size = 1000.0
+    eject_records = [bytes((31 * r + i) & 0x7F for i in range(10)) for r in range(5)]
+    item_records = [bytes([r % 4]) + bytes((17 * r + i + 100) & 0xFF for i in range(6)) for r in range(6)]
+    data = (
+        struct.pack(">BifBBHHBB", PacketType.GAME_DATA.value, 1, map_size, 0, 5, 0, 0, 9, 6)
+        + b"".join(eject_records)
+        + b"".join(item_records)
+    )
+
+    packet = asyncio.run(GameData.read(None, PacketType.GAME_DATA, data))  # type: ignore
+
+    def field(record: bytes, start: int) -> int:
+        return int.from_bytes(record[start:start + 3], byteorder="big")
+
+    assert packet.eject_objects == [
+        NetPlayerEject(
+            record[0],
+            from_3(map_size, field(record, 1)),
+            from_3(map_size, field(record, 4)),
+            from_3(500000.0, field(record, 7)),
+        )
+        for record in eject_records
+    ]
+    assert packet.item_objects == [
+        NetGameItem(9 + r, Item(record[0]), from_3(map_size, field(record, 1)), from_3(map_size, field(record, 4)))
+        for r, record in enumerate(item_records)
+    ]
+    assert packet.dot_ids == range(0)
+    assert packet.dot_xs == packet.dot_ys == []
+
+
+def test_connect_request_3_write(monkeypatch: pytest.MonkeyPatch):
+    # the server rejects the handshake if a single byte moves, so pin the whole packet
+    # for a fixed rng seed and timestamp. the shuffle seed comes from the same rng.
+    monkeypatch.setattr(packets.time, "time_ns", lambda: 1700000000123000000)
+    client = SimpleNamespace(server_data=ServerData(), rng=JavaRNG(1234))
+    packet = ConnectRequest3(
+        PacketType.CONNECT_REQUEST_3,
+        GameMode.FFA,
+        GameDifficulty.EASY,
+        0x01020304,
+        MUTF8String.from_py_string("ticket"),
+        OnlineStatus.ONLINE,
+        True,
+        Skin.MISC_8BALL,
+        7,
+        MUTF8String.from_py_string("alias"),
+        0x0A0B0C0D,
+        VariableLengthArray.from_py_list(1, [-1, 0, 0]),
+        3,
+        0x11223344,
+        MUTF8String.from_py_string("pet"),
+        5,
+        0x55667788,
+        2,
+        4,
+        MUTF8String.from_py_string("pet2"),
+        0x0102,
+        0x0304,
+        6,
+        Font.DEFAULT,
+        VariableLengthArray.from_py_list(1, [1, 2]),
+        NameAnimation.NONE,
+        Skin.MISC_8BALL,
+        CompressedFloat(0.5, 60.0),
+        0x0F0E0D0C,
+        VariableLengthArray.from_py_list(2, range(40)),
+    )
+
+    expected = bytes.fromhex(
+        "7600000000428197d1f38c2dda010069046501000288220e680f141803630002"
+        "1100190402062500006900330374001524010300061a00228b0f0c660dcd6b03"
+        "00120000ff0605201f1d4461cf020a026c0408070d1303650470327426746827"
+        "031b000c0a020e00010d7000040b0521100100650716740200012277e5281e0b"
+        "04610c1700230973011c7b050055a5a886010011"
+    )
+
+    assert packet.write(client) == expected  # type: ignore[arg-type]
+    assert client.server_data.client_id == -1517918040
+
+
+@pytest.mark.parametrize(
+    ("angle", "speed", "aspect_ratio", "expected"),
+    [
+        # in range values
+        (math.pi, 0.5, 2.0, (0x7FFF, 0x7F, 0x7F)),
+        # a negative angle wraps around to its positive turn, speed and aspect ratio clamp to their lower bounds
+        (-math.pi / 2, -0.5, 0.5, (0xC001, 0x00, 0x00)),
+        # an angle past 2pi wraps around, speed and aspect ratio clamp to their upper bounds
+        (math.tau + math.pi / 2, 1.5, 4.0, (0x3FFE, 0xFF, 0xFF)),
+    ],
+)
+def test_control_write(angle: float, speed: float, aspect_ratio: float, expected: tuple[int, int, int]):
+    client = SimpleNamespace(
+        server_data=ServerData(client_id=0x0A0B0C0D, public_id=0x01020304),
+        control_ticks=254,
+        game_player=SimpleNamespace(index=9),
+    )
+    packet = Control(PacketType.CONTROL, angle, speed, ControlFlags.SPLIT | ControlFlags.SHOOT, aspect_ratio)
+
+    angle_bits, speed_bits, aspect_ratio_bits = expected
+
+    assert packet.write(client) == (  # type: ignore[arg-type]
+        bytes([PacketType.CONTROL.value, 0x01, 0x02, 0x03, 0x04])
+        + angle_bits.to_bytes(2, byteorder="big")
+        + bytes([speed_bits, 254, 0x03, 9, 0x0A, 0x0B, 0x0C, 0x0D, aspect_ratio_bits])
+    )
+    # the tick counter wraps at 0xff
+    assert client.control_ticks == 0
+
+
+def test_keep_alive_write():
+    packet = KeepAlive(PacketType.KEEP_ALIVE, 0x01020304, -2, socket.inet_aton("192.168.1.20"), 0x0A0B0C0D)
+
+    # the server ip is the only little endian field
+    assert packet.write(None) == bytes.fromhex("03 01020304 fffffffe 1401a8c0 0a0b0c0d")  # type: ignore[arg-type]
+
+    # the packet is reused for the whole session, so a new server ip has to show up in the next write
+    packet.server_ip = socket.inet_aton("10.0.0.1")
+    assert packet.write(None) == bytes.fromhex("03 01020304 fffffffe 0100000a 0a0b0c0d")  # type: ignore[arg-type]
+
+
+def test_disconnect_write():
+    packet = Disconnect(PacketType.DISCONNECT, 0x01020304, -2, 0x0A0B0C0D)
+
+    assert packet.write(None) == bytes.fromhex("07 01020304 fffffffe 0a0b0c0d")  # type: ignore[arg-type]
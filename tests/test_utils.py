@@ -0,0 +1,94 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+# utils isn't a package, so the scripts are loaded straight from their files
+_JAVAENUM2PY = Path(__file__).parent.parent / "utils" / "javaenum2py.py"
+
+
+@pytest.fixture(scope="module")
+def javaenum2py():
+    spec = importlib.util.spec_from_file_location("javaenum2py", _JAVAENUM2PY)
+    module = importlib.util.module_from_spec(spec)  # type: ignore[arg-type]
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+
+    return module
+
+
+def test_extract_enum_data_string_arg(javaenum2py):
+    src = """
+    public enum Mode {
+        A("a;b"),
+        B("c", 2);
+
+        private final String name;
+
+        Mode(String name) {
+            this.name = name;
+        }
+    }
+    """
+
+    assert javaenum2py.extract_enum_data(src) == (
+        "class Mode(enum.Enum):\n"
+        '    A = 0x00  # "a;b"\n'
+        '    B = 0x01  # "c", 2\n'
+    )
+
+
+def test_extract_enum_data_comment(javaenum2py):
+    src = """
+    enum Mode {
+        A, // the default; always first
+        /* B; was removed */ C;
+
+        int value;
+    }
+    """
+
+    assert javaenum2py.extract_enum_data(src) == (
+        "class Mode(enum.Enum):\n"
+        "    A = 0x00\n"
+        "    C = 0x01\n"
+    )
+
+
+def test_extract_enum_data_member_body(javaenum2py):
+    src = """
+    enum Mode {
+        A {
+            int value() { return 1; }
+        },
+        B(2) {
+            int value() { return 2; }
+        },
+        C;
+
+        abstract int value();
+    }
+    """
+
+    assert javaenum2py.extract_enum_data(src) == (
+        "class Mode(enum.Enum):\n"
+        "    A = 0x00\n"
+        "    B = 0x01  # 2\n"
+        "    C = 0x02\n"
+    )
+
+
+def test_extract_enum_data_no_semicolon(javaenum2py):
+    src = """
+    enum Mode {
+        A,
+        B,
+        C
+    }
+    """
+
+    assert javaenum2py.extract_enum_data(src) == (
+        "class Mode(enum.Enum):\n"
+        "    A = 0x00\n"
+        "    B = 0x01\n"
+        "    C = 0x02\n"
+    )
@@ -1,18 +1,30 @@
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 
-import requests
-from dotenv import dotenv_values
+from dotenv import load_dotenv
 
-secrets = dotenv_values("../.env.secrets")
+from nebulous.game.account import SESSION
+from nebulous.game.enums import CustomSkinType
+
+load_dotenv(Path(__file__).parent.parent / ".env.secrets", override=False)
 
 url = "https://simplicialsoftware.com/api/account/GetSkinIDs"
 
 data = {
     "Game": "Nebulous",
     "Version": "1229",
-    "Ticket": secrets.get("TICKET", ""),
-    "Type": "ALL",
+    "Ticket": os.environ.get("TICKET", ""),
 }
 
-response = requests.post(url, data=data, timeout=10).json()
-print(json.dumps(response, indent=2))
+# probe every skin type at once over the shared session, printing responses as they arrive
+with ThreadPoolExecutor(max_workers=8) as executor:
+    futures = {
+        executor.submit(SESSION.post, url, data={**data, "Type": skin_type.name}, timeout=10): skin_type
+        for skin_type in CustomSkinType
+    }
+
+    for future in as_completed(futures):
+        print(f"{futures[future].name}:")
+        print(json.dumps(future.result().json(), indent=2))
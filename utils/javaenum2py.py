@@ -1,70 +1,153 @@
+from __future__ import annotations
+
 import re
 import sys
-from tkinter import *
-from tkinter.scrolledtext import ScrolledText
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from tkinter import Tk
+
+
+_CLASS_NAME_RE = re.compile(r"\benum\s+([A-Za-z_]\w*)")
+_ENUM_MEMBER_RE = re.compile(r"(\w+)\s*(?:\((.*)\))?", re.DOTALL)
+# string and char literals and comments are matched whole so that any ; , or } inside them is skipped
+_MEMBER_LIST_TOKEN_RE = re.compile(r"\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*'|//[^\n]*|/\*.*?\*/|[;,{}()]", re.DOTALL)
+
+
+def _find_member_list_end(src: str, start: int) -> int:
+    # the member list ends at the first ; or } that isn't nested in the members' ctor args or bodies
+    depth = 0
+
+    for token in _MEMBER_LIST_TOKEN_RE.finditer(src, start):
+        char = token.group()
+
+        if char in "({":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "}":
+            if depth == 0:
+                return token.start()
+
+            depth -= 1
+        elif char == ";" and depth == 0:
+            return token.start()
+
+    return len(src)
+
+
+def _split_members(member_list: str) -> list[str]:
+    # split the member list on the commas between members, dropping comments and member bodies
+    members = []
+    current = []
+    parens = braces = 0
+    pos = 0
+
+    for token in _MEMBER_LIST_TOKEN_RE.finditer(member_list):
+        if braces == 0:
+            current.append(member_list[pos:token.start()])
+
+        pos = token.end()
+        text = token.group()
 
+        if text.startswith(("//", "/*")):
+            continue
+
+        if text in "{}":
+            braces += 1 if text == "{" else -1
+        elif braces:
+            continue
+        elif text == "," and parens == 0:
+            members.append("".join(current))
+            current = []
+        else:
+            parens += {"(": 1, ")": -1}.get(text, 0)
+            current.append(text)
+
+    current.append(member_list[pos:])
+    members.append("".join(current))
+
+    return [member.strip() for member in members if member.strip()]
 
-def extract_enum_data():
-    enum_class_def = st.get(1.0, END)
-    class_name_pattern = r"\benum\s+([A-Za-z_]\w*)"
-    enum_member_pattern = r"^\s*(\w+)\s*(?:\(([^)]*)\))?\s*(?:,|;)?\s*$"
 
+def extract_enum_data(enum_class_def: str) -> str:
     # find class name
-    class_name_match = re.search(class_name_pattern, enum_class_def)
+    class_name_match = _CLASS_NAME_RE.search(enum_class_def)
 
     if class_name_match:
         class_name = class_name_match.group(1)
+        body_start = enum_class_def.find("{", class_name_match.end()) + 1
     else:
         class_name = None
+        body_start = enum_class_def.find("{") + 1
 
-    # extract enum members and ctor args
+    # extract enum members and ctor args. the members are listed first in the
+    # enum body, up to the semicolon that ends the list (or the closing brace
+    # if the enum has no other members).
     enum_members = []
-    inside_enum = False
+    body = ""
 
-    for line in enum_class_def.split("\n"):
-        line = line.strip()
+    if body_start > 0:
+        body = enum_class_def[body_start:_find_member_list_end(enum_class_def, body_start)]
 
-        if "{" in line:
-            inside_enum = True
-        if "}" in line:
-            inside_enum = False
+    for member in _split_members(body):
+        match = _ENUM_MEMBER_RE.fullmatch(member)
 
-        if inside_enum and line and not line.startswith("public") and not line.startswith("private"):
-            match = re.match(enum_member_pattern, line)
+        if match is None:
+            continue
 
-            if match:
-                enum_member = match.group(1)
-                constructor_args = match.group(2)
+        enum_member = match.group(1)
+        constructor_args = match.group(2)
 
-                if constructor_args:
-                    args_list = [arg.strip() for arg in constructor_args.split(",")]
-                    enum_members.append((enum_member, args_list))
-                else:
-                    enum_members.append((enum_member, None))
+        if constructor_args:
+            args_list = [arg.strip() for arg in constructor_args.split(",")]
+            enum_members.append((enum_member, args_list))
+        else:
+            enum_members.append((enum_member, None))
 
     # generate python enum class
-    python_enum_class = f"class {class_name}(enum.Enum):\n"
+    parts = [f"class {class_name}(enum.Enum):\n"]
+    member_fmt = "    {} = 0x{:02X}\n".format
+    member_args_fmt = "    {} = 0x{:02X}  # {}\n".format
+
     for idx, item in enumerate(enum_members):
         member, args = item
 
-        python_enum_class += f"    {member} = 0x{idx:02X}"
+        parts.append(member_args_fmt(member, idx, ", ".join(args)) if args else member_fmt(member, idx))
+
+    return "".join(parts)
+
+
+def _build_tk() -> Tk:
+    # tk is only needed for the gui, so don't pay for loading it when converting piped input
+    from tkinter import END, Button, Label, Tk
+    from tkinter.scrolledtext import ScrolledText
+
+    mainwin = Tk()
+    Label(mainwin, text="Enter Java Enum Class:").grid(row=0, column=0)
+    st = ScrolledText(mainwin, height=20, width=60)
+    st.grid(row=1, column=0, columnspan=3)
+
+    def on_extract():
+        # print to stdout and exit
+        print(extract_enum_data(st.get(1.0, END)))
+        sys.exit()
+
+    Button(mainwin, text="Extract Data", command=on_extract).grid(row=2, column=0, sticky="EW")
+    Button(mainwin, text="Exit", command=sys.exit).grid(row=2, column=1, columnspan=2, sticky="EW")
+
+    return mainwin
 
-        if args:
-            python_enum_class += f"  # {', '.join(args)}\n"
-        else:
-            python_enum_class += "\n"
 
-    # print to stdout and exit
-    print(python_enum_class)
-    sys.exit()
+def main():
+    # when input is piped in, convert it and skip the gui entirely
+    if sys.stdin is not None and not sys.stdin.isatty():
+        print(extract_enum_data(sys.stdin.read()))
 
+        return
 
-mainwin = Tk()
-Label(mainwin, text="Enter Java Enum Class:").grid(row=0, column=0)
-st = ScrolledText(mainwin, height=20, width=60)
-st.grid(row=1, column=0, columnspan=3)
+    _build_tk().mainloop()
 
-Button(mainwin, text="Extract Data", command=extract_enum_data).grid(row=2, column=0, sticky="EW")
-Button(mainwin, text="Exit", command=sys.exit).grid(row=2, column=1, columnspan=2, sticky="EW")
 
-mainwin.mainloop()
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,19 @@
+from __future__ import annotations
+
 import re
 import sys
-from tkinter import *
-from tkinter.scrolledtext import ScrolledText
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from tkinter import Tk
+
 
+_ARRAY_RE = re.compile(r"public\s+static\s+final\s+int\[\]\s+(\w+)\s*=\s*\{([^}]*)\};")
 
-def extract_array_data():
-    java_array_definition = st.get(1.0, END)
-    array_pattern = r"public\s+static\s+final\s+int\[\]\s+(\w+)\s*=\s*\{([^}]*)\};"
 
+def extract_array_data(java_array_definition: str) -> str:
     # find array name and elements
-    array_match = re.search(array_pattern, java_array_definition)
+    array_match = _ARRAY_RE.search(java_array_definition)
     if array_match:
         array_name = array_match.group(1)
         array_elements = array_match.group(2).split(",")
@@ -19,23 +23,46 @@ def extract_array_data():
         array_elements = []
 
     # generate enum class
-    python_enum_class = f"class {array_name}(enum.Enum):\n"
+    parts = [f"class {array_name}(enum.Enum):\n"]
+    member_fmt = "    {} = 0x{:02X}\n".format
 
     for idx, element in enumerate(array_elements):
-        element_name = element.split(".")[-1].upper()
-        python_enum_class += f"    {element_name} = 0x{idx:02X}\n"
+        element_name = element.rpartition(".")[2].upper()
+        parts.append(member_fmt(element_name, idx))
+
+    return "".join(parts)
+
+
+def _build_tk() -> Tk:
+    # tk is only needed for the gui, so don't pay for loading it when converting piped input
+    from tkinter import END, Button, Label, Tk
+    from tkinter.scrolledtext import ScrolledText
+
+    mainwin = Tk()
+    Label(mainwin, text="Enter Java Array of Resource IDs:").grid(row=0, column=0)
+    st = ScrolledText(mainwin, height=20, width=60)
+    st.grid(row=1, column=0, columnspan=3)
+
+    def on_extract():
+        # print to stdout and exit
+        print(extract_array_data(st.get(1.0, END)))
+        sys.exit()
+
+    Button(mainwin, text="Extract Data", command=on_extract).grid(row=2, column=0, sticky="EW")
+    Button(mainwin, text="Exit", command=sys.exit).grid(row=2, column=1, columnspan=2, sticky="EW")
+
+    return mainwin
+
 
-    # print to stdout n exit
-    print(python_enum_class)
-    sys.exit()
+def main():
+    # when input is piped in, convert it and skip the gui entirely
+    if sys.stdin is not None and not sys.stdin.isatty():
+        print(extract_array_data(sys.stdin.read()))
 
+        return
 
-mainwin = Tk()
-Label(mainwin, text="Enter Java Array of Resource IDs:").grid(row=0, column=0)
-st = ScrolledText(mainwin, height=20, width=60)
-st.grid(row=1, column=0, columnspan=3)
+    _build_tk().mainloop()
 
-Button(mainwin, text="Extract Data", command=extract_array_data).grid(row=2, column=0, sticky="EW")
-Button(mainwin, text="Exit", command=sys.exit).grid(row=2, column=1, columnspan=2, sticky="EW")
 
-mainwin.mainloop()
+if __name__ == "__main__":
+    main()